@@ -0,0 +1,99 @@
+"""Change log consumers: long-polling and per-candidate match deltas."""
+import asyncio
+import time
+from typing import List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from app import crud, matching, models
+from app.database import SessionLocal
+
+# How often a waiting consumer re-checks the change log
+POLL_INTERVAL_SECONDS = 0.25
+
+
+def _read_changes(since: int, limit: int) -> List[models.ChangeEvent]:
+    """Read a page of changes using a short-lived session."""
+    db = SessionLocal()
+    try:
+        changes = crud.get_changes(db, since=since, limit=limit)
+        db.expunge_all()  # Detach so the rows stay readable after close
+        return changes
+    finally:
+        db.close()
+
+
+async def wait_for_changes(since: int, limit: int, timeout: float) -> List[models.ChangeEvent]:
+    """
+    Return changes after `since`, waiting up to `timeout` seconds for new ones.
+
+    The log is polled rather than signalled so that writes made by other
+    worker processes sharing the database are picked up as well.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        changes = await run_in_threadpool(_read_changes, since, limit)
+        remaining = deadline - time.monotonic()
+        if changes or remaining <= 0:
+            return changes
+        await asyncio.sleep(min(POLL_INTERVAL_SECONDS, remaining))
+
+
+def _job_from_snapshot(job_id: int, snapshot: dict) -> models.Job:
+    """Build a transient Job from a change event payload."""
+    job = models.Job(
+        id=job_id,
+        title=snapshot["title"],
+        min_years_experience=snapshot["min_years_experience"]
+    )
+    job.set_skills_list(snapshot["required_skills"])
+    return job
+
+
+def compute_match_deltas(
+    candidate: models.Candidate,
+    changes: List[models.ChangeEvent]
+) -> Tuple[Optional[models.Candidate], List[Tuple[int, str, dict]]]:
+    """
+    Translate change events into match deltas for one candidate.
+    
+    Only the jobs named by each event are scored. Single-row events are scored
+    from their snapshot; batched events load just the listed jobs. Reads use
+    a short-lived session, so long-lived streams hold no pooled connection
+    between calls.
+    
+    Args:
+        candidate: Candidate the deltas are computed for (may be detached)
+        changes: Change events in sequence order
+        
+    Returns:
+        The (possibly reloaded, detached) candidate, or None if it was deleted,
+        and a list of (seq, event, data) tuples where event is one of "added",
+        "updated", "removed", "reset" or "closed"
+    """
+    candidate_id = candidate.id
+    deltas = []
+    db = SessionLocal()
+    try:
+        for change in changes:
+            if change.entity == "candidate":
+                if change.entity_id != candidate_id:
+                    continue
+                if change.op == "delete":
+                    deltas.append((change.seq, "closed", {"candidateId": candidate_id}))
+                    return None, deltas
+                # Every score depends on the candidate, so clients refetch instead
+                candidate = crud.get_candidate(db, candidate_id) or candidate  # A later event closes the stream
+                deltas.append((change.seq, "reset", {"candidateId": candidate_id}))
+                continue
+            
+            if change.op == "delete":
+                deltas.append((change.seq, "removed", {"jobId": change.entity_id}))
+            elif change.op == "bulk_create":
+                for job in crud.get_jobs_by_ids(db, change.get_payload()["ids"]):
+                    deltas.append((change.seq, "added", matching.build_job_match(candidate, job)))
+            else:
+                job = _job_from_snapshot(change.entity_id, change.get_payload())
+                event = "added" if change.op == "create" else "updated"
+                deltas.append((change.seq, event, matching.build_job_match(candidate, job)))
+        return candidate, deltas
+    finally:
+        db.close()  # Detaches the candidate with its loaded attributes
@@ -0,0 +1,39 @@
+"""Transparent zlib compression for large text columns."""
+import os
+import zlib
+from typing import Optional
+
+# Texts at least this many UTF-8 bytes long are stored compressed
+COMPRESSION_THRESHOLD = int(os.getenv("DESCRIPTION_COMPRESSION_THRESHOLD", "1024"))
+
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(value: Optional[str], threshold: Optional[int] = None) -> Optional[bytes]:
+    """
+    Compress a text if it is long enough and compression pays off.
+
+    Args:
+        value: Text to store
+        threshold: Minimum UTF-8 length to compress (defaults to COMPRESSION_THRESHOLD)
+
+    Returns:
+        The zlib-compressed UTF-8 bytes, or None to store the text as is
+    """
+    if value is None:
+        return None
+    raw = value.encode("utf-8")
+    if len(raw) < (COMPRESSION_THRESHOLD if threshold is None else threshold):
+        return None
+    compressed = zlib.compress(raw, COMPRESSION_LEVEL)
+    return compressed if len(compressed) < len(raw) else None
+
+
+def decompress_text(value: bytes) -> str:
+    """Inverse of compress_text."""
+    return zlib.decompress(value).decode("utf-8")
+
+
+def sqlite_zdecompress(value: Optional[bytes]) -> Optional[str]:
+    """`zdecompress(blob)` SQL function, so triggers and views can read compressed text."""
+    return decompress_text(value) if value is not None else None
@@ -0,0 +1,118 @@
+"""Request coalescing and admission control for expensive computations."""
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Hashable
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of queued."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class _Call:
+    """An in-flight computation shared by concurrent callers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Run a function at most once per key among concurrent callers.
+
+    The first caller for a key computes the result; callers that arrive while
+    it is running wait for it and receive the same result (or exception).
+    Nothing is cached once the computation finishes.
+
+    Waiting callers still hold a thread each, so pass `follow` (e.g.
+    AdmissionController.queued) to bound them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], follow: Callable[[], ContextManager] = nullcontext) -> Any:
+        """
+        Call `fn`, or wait for an identical in-flight call and share its result.
+
+        Args:
+            key: Identifies identical calls
+            fn: The computation
+            follow: Context manager factory entered around a follower's wait;
+                exceptions it raises reach the follower instead of waiting
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            with follow():
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AdmissionController:
+    """
+    Bound the number of concurrent computations, with a bounded wait queue.
+
+    Requests beyond `max_concurrent` wait up to `queue_timeout` seconds for a
+    slot; once `max_queue` requests are already waiting, new ones are rejected
+    immediately with Overloaded so latency stays flat for admitted requests.
+    Callers waiting on another request's computation (see `queued`) count
+    against the same queue.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float, retry_after: int = 1):
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+    @contextmanager
+    def admit(self):
+        """Hold a concurrency slot for the duration of the block."""
+        if not self._slots.acquire(blocking=False):
+            with self.queued():
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            if not acquired:
+                raise Overloaded(self.retry_after)
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def queued(self):
+        """Hold a place in the wait queue for the duration of the block, or raise Overloaded if it is full."""
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                raise Overloaded(self.retry_after)
+            self._waiting += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._waiting -= 1
@@ -1,33 +1,563 @@
 """CRUD operations for jobs and candidates."""
+import hashlib
+import json
+from collections import Counter
+from sqlalchemy import LargeBinary, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app import models, schemas
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app import compression, matching, models, schemas, search, similarity
+from app.database import IN_CHUNK_SIZE
+
+
+# Change log helpers
+def _job_snapshot(db_job: models.Job) -> dict:
+    """Serializable view of a job for change events."""
+    return {
+        "title": db_job.title,
+        "description": db_job.description,
+        "required_skills": db_job.get_skills_list(),
+        "min_years_experience": db_job.min_years_experience,
+    }
+
+
+def _job_change_payload(db_job: models.Job) -> dict:
+    """
+    Job snapshot for change events, without the description.
+    
+    The change log is never pruned, and a copy of every description would
+    outgrow the (compressed) jobs table; readers that need it fetch the job.
+    """
+    payload = _job_snapshot(db_job)
+    del payload["description"]
+    return payload
+
+
+def _candidate_snapshot(db_candidate: models.Candidate) -> dict:
+    """Serializable view of a candidate for change events."""
+    return {
+        "name": db_candidate.name,
+        "skills": db_candidate.get_skills_list(),
+        "years_experience": db_candidate.years_experience,
+    }
+
+
+def _content_hash(snapshot: dict) -> str:
+    """Stable hash of an entity's content fields, for change detection on upsert."""
+    return hashlib.sha256(json.dumps(snapshot, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def record_change(
+    db: Session,
+    entity: str,
+    op: str,
+    entity_id: Optional[int] = None,
+    payload=None
+) -> models.ChangeEvent:
+    """Append a change event to the current transaction (committed by the caller)."""
+    event = models.ChangeEvent(entity=entity, op=op, entity_id=entity_id)
+    event.set_payload(payload)
+    db.add(event)
+    return event
+
+
+def get_changes(db: Session, since: int = 0, limit: int = 100) -> List[models.ChangeEvent]:
+    """Get change events with a sequence number greater than `since`, oldest first."""
+    return (
+        db.query(models.ChangeEvent)
+        .filter(models.ChangeEvent.seq > since)
+        .order_by(models.ChangeEvent.seq)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_latest_change_seq(db: Session) -> int:
+    """Get the sequence number of the most recent change event (0 if none)."""
+    return db.query(func.max(models.ChangeEvent.seq)).scalar() or 0
+
+
+# Job alert helpers
+def _queue_percolation(db: Session, job_ids: List[int]) -> None:
+    """
+    Queue matching new jobs against candidate alerts, in the caller's transaction.
+    
+    The task commits with the jobs (or not at all) and runs once they are
+    visible. Nothing is queued while no candidate has alerts enabled.
+    """
+    from app import tasks  # tasks imports crud
+    if job_ids and db.query(models.Candidate.id).filter(models.Candidate.alert_threshold.is_not(None)).first():
+        tasks.enqueue(db, "percolate_jobs", {"job_ids": job_ids}, commit=False)
+
+
+def find_alerted_candidates(db: Session, job: models.Job) -> List[Tuple[int, int]]:
+    """
+    Find the candidates whose alert threshold a job meets, without scanning all candidates.
+    
+    Without a shared skill a job scores at most 30 (the experience part), so
+    candidates with a higher threshold are reached only through the
+    candidate_skills postings of the job's skills. The rest come from the
+    (alert_threshold, years_experience) index. Scores are then computed
+    exactly with matching.score_from_counts.
+    
+    Args:
+        db: Database session
+        job: Newly posted job
+        
+    Returns:
+        List of (candidate_id, match_score) pairs, ordered by candidate ID
+    """
+    skills = list(dict.fromkeys(job.get_skills_list()))
+    min_years = job.min_years_experience
+    alerted = {}
+    
+    if skills:
+        overlap = func.count().label("overlap")
+        shares_skills = db.execute(
+            select(models.Candidate.id, models.Candidate.years_experience, models.Candidate.alert_threshold, overlap)
+            .join(models.CandidateSkill, models.CandidateSkill.candidate_id == models.Candidate.id)
+            .where(models.CandidateSkill.skill.in_(skills), models.Candidate.alert_threshold.is_not(None))
+            .group_by(models.Candidate.id)
+        )
+        for candidate_id, years, threshold, shared in shares_skills:
+            score = matching.score_from_counts(shared, len(skills), years, min_years)
+            alerted[candidate_id] = score if score >= threshold else None
+    
+    # Best score without a shared skill is 30; round(30 * years / min_years) >= threshold
+    # requires 60 * years >= (2 * threshold - 1) * min_years
+    ceiling = matching.score_from_counts(0, len(skills), min_years, min_years)
+    experience_only = db.execute(
+        select(models.Candidate.id, models.Candidate.years_experience, models.Candidate.alert_threshold)
+        .where(
+            models.Candidate.alert_threshold <= ceiling,
+            60 * models.Candidate.years_experience >= (2 * models.Candidate.alert_threshold - 1) * min_years
+        )
+    )
+    for candidate_id, years, threshold in experience_only:
+        if candidate_id in alerted:
+            continue  # Already scored with its skill overlap
+        score = matching.score_from_counts(0, len(skills), years, min_years)
+        if score >= threshold:
+            alerted[candidate_id] = score
+    
+    return sorted((candidate_id, score) for candidate_id, score in alerted.items() if score is not None)
+
+
+def create_notifications(db: Session, job_id: int, alerted: List[Tuple[int, int]]) -> int:
+    """
+    Record a job's notifications, skipping any that already exist.
+    
+    Args:
+        db: Database session
+        job_id: Job that met the candidates' thresholds
+        alerted: (candidate_id, match_score) pairs from find_alerted_candidates
+        
+    Returns:
+        Number of notifications added
+    """
+    notified = {
+        candidate_id
+        for (candidate_id,) in db.query(models.Notification.candidate_id).filter(models.Notification.job_id == job_id)
+    }
+    rows = [
+        {"candidate_id": candidate_id, "job_id": job_id, "match_score": score}
+        for candidate_id, score in alerted
+        if candidate_id not in notified
+    ]
+    if rows:
+        db.execute(sqlite_insert(models.Notification).on_conflict_do_nothing(), rows)
+    db.commit()
+    return len(rows)
+
+
+def get_notifications(
+    db: Session,
+    candidate_id: int,
+    since: int = 0,
+    limit: int = 50
+) -> List[models.Notification]:
+    """Get a candidate's notifications with an ID greater than `since`, oldest first."""
+    return (
+        db.query(models.Notification)
+        .filter(models.Notification.candidate_id == candidate_id, models.Notification.id > since)
+        .order_by(models.Notification.id)
+        .limit(limit)
+        .all()
+    )
+
+
+# Skill statistics helpers
+def _skill_delta(old_skills: Iterable[str], new_skills: Iterable[str]) -> Counter:
+    """Per-skill count change when an entity's skills go from old to new."""
+    old, new = set(old_skills), set(new_skills)
+    delta = Counter({skill: 1 for skill in new - old})
+    delta.update({skill: -1 for skill in old - new})
+    return delta
+
+
+def _update_skill_stats(db: Session, entity: str, delta: Dict[str, int]) -> None:
+    """
+    Apply per-skill count changes in the caller's transaction.
+
+    Args:
+        db: Database session
+        entity: "job" (demand) or "candidate" (supply)
+        delta: Skill -> change in the number of jobs or candidates listing it
+    """
+    delta = {skill: change for skill, change in delta.items() if change}
+    if not delta:
+        return
+    column = "job_count" if entity == "job" else "candidate_count"
+    sign = 1 if entity == "job" else -1
+    stmt = sqlite_insert(models.SkillStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.SkillStat.skill],
+        set_={
+            column: getattr(models.SkillStat, column) + getattr(stmt.excluded, column),
+            "gap": models.SkillStat.gap + stmt.excluded.gap,
+        }
+    )
+    db.execute(stmt, [
+        {
+            "skill": skill,
+            "job_count": change if entity == "job" else 0,
+            "candidate_count": change if entity == "candidate" else 0,
+            "gap": sign * change,
+        }
+        for skill, change in delta.items()
+    ])
+    if any(change < 0 for change in delta.values()):
+        db.query(models.SkillStat).filter(
+            models.SkillStat.skill.in_([skill for skill, change in delta.items() if change < 0]),
+            models.SkillStat.job_count == 0,
+            models.SkillStat.candidate_count == 0
+        ).delete(synchronize_session=False)
+
+
+_SKILL_STATS_ORDER = {
+    "demand": models.SkillStat.job_count,
+    "supply": models.SkillStat.candidate_count,
+    "gap": models.SkillStat.gap,
+}
+
+
+def get_skill_stats(db: Session, sort: str = "demand", limit: int = 20) -> List[models.SkillStat]:
+    """
+    Get the top skills by a counter.
+
+    Args:
+        db: Database session
+        sort: "demand" (most required by jobs), "supply" (most common among
+            candidates) or "gap" (largest shortfall of candidates vs jobs)
+        limit: Number of skills to return
+
+    Returns:
+        List of SkillStat rows, highest first (ties by skill name)
+    """
+    column = _SKILL_STATS_ORDER[sort]
+    query = db.query(models.SkillStat)
+    if sort != "gap":
+        query = query.filter(column > 0)
+    return query.order_by(column.desc(), models.SkillStat.skill).limit(limit).all()
 
 
 # Job CRUD operations
-def create_job(db: Session, job: schemas.JobCreate) -> models.Job:
-    """Create a new job."""
+def _new_job(job: schemas.JobCreate) -> models.Job:
+    """Build an unsaved Job from a create schema."""
     db_job = models.Job(
         title=job.title,
         description=job.description,
         min_years_experience=job.min_years_experience
     )
     db_job.set_skills_list(job.required_skills)
+    db_job.content_hash = _content_hash(_job_snapshot(db_job))
+    return db_job
+
+
+def _find_duplicate(db: Session, db_job: models.Job) -> Optional[models.Job]:
+    """Find a stored near-duplicate of an unsaved job (none while the similarity index is being built)."""
+    duplicates = similarity.find_similar_jobs(db_job, similarity.DUPLICATE_THRESHOLD, limit=1)
+    return get_job(db, duplicates[0][0]) if duplicates else None
+
+
+def _original_id(db_job: models.Job) -> int:
+    """ID of the first posting in a job's duplicate chain."""
+    return db_job.duplicate_of or db_job.id
+
+
+def create_job(
+    db: Session,
+    job: schemas.JobCreate,
+    on_duplicate: Optional[str] = None
+) -> models.Job:
+    """
+    Create a new job.
+    
+    Near-duplicates of a stored job are handled per `on_duplicate` (defaults
+    to similarity.DUPLICATE_POLICY): "allow" inserts as usual, "flag" inserts
+    with `duplicate_of` set, and "merge" returns the stored job instead.
+    """
+    db_job = _new_job(job)
+    
+    policy = on_duplicate or similarity.DUPLICATE_POLICY
+    if policy != "allow":
+        original = _find_duplicate(db, db_job)
+        if original is not None and policy == "merge":
+            return original
+        if original is not None:
+            db_job.duplicate_of = _original_id(original)
     
     db.add(db_job)
+    db.flush()  # Assign the id before logging the change
+    record_change(db, "job", "create", db_job.id, _job_change_payload(db_job))
+    _update_skill_stats(db, "job", _skill_delta([], job.required_skills))
+    _queue_percolation(db, [db_job.id])
     db.commit()
     db.refresh(db_job)
     return db_job
 
 
+def create_jobs(
+    db: Session,
+    jobs: List[schemas.JobCreate],
+    on_duplicate: Optional[str] = None,
+    commit: bool = True
+) -> List[models.Job]:
+    """
+    Create several jobs in one transaction, logged as a single batched event.
+    
+    Near-duplicates of stored jobs or of earlier jobs in the batch are handled
+    as in create_job. The result has one job per input, in input order.
+    Pass commit=False to flush only, leaving the commit to the caller's transaction.
+    """
+    policy = on_duplicate or similarity.DUPLICATE_POLICY
+    batch_index = similarity.MinHashLSH()  # Earlier jobs of this batch, keyed by position
+    
+    results = []
+    new_jobs = []
+    batch_duplicates = []  # (new job, earlier job of the batch it duplicates)
+    for position, job in enumerate(jobs):
+        db_job = _new_job(job)
+        if policy != "allow":
+            original = _find_duplicate(db, db_job)
+            tokens = similarity.job_tokens(job.title, job.required_skills)
+            in_batch = batch_index.query(tokens, similarity.DUPLICATE_THRESHOLD, limit=1)
+            batch_index.add(position, tokens)
+            if policy == "merge" and (original is not None or in_batch):
+                results.append(original if original is not None else results[in_batch[0][0]])
+                continue
+            if original is not None:
+                db_job.duplicate_of = _original_id(original)
+            elif in_batch:
+                batch_duplicates.append((db_job, results[in_batch[0][0]]))
+        results.append(db_job)
+        new_jobs.append(db_job)
+    
+    db.add_all(new_jobs)
+    db.flush()
+    for db_job, earlier in batch_duplicates:
+        db_job.duplicate_of = _original_id(earlier)
+    new_ids = [j.id for j in new_jobs]
+    if new_ids:
+        record_change(db, "job", "bulk_create", payload={"ids": new_ids})
+    _queue_percolation(db, new_ids)
+    skill_delta = Counter()
+    for db_job in new_jobs:
+        skill_delta.update(set(db_job.get_skills_list()))
+    _update_skill_stats(db, "job", skill_delta)
+    if not commit:
+        db.flush()
+        return results
+    db.commit()
+    
+    get_jobs_by_ids(db, list({j.id for j in results}))  # Reload the expired rows in one round trip
+    return results
+
+
 def get_job(db: Session, job_id: int) -> Optional[models.Job]:
     """Get a job by ID."""
     return db.query(models.Job).filter(models.Job.id == job_id).first()
 
 
-def get_all_jobs(db: Session, skip: int = 0, limit: int = 100) -> List[models.Job]:
-    """Get all jobs."""
-    return db.query(models.Job).offset(skip).limit(limit).all()
+def get_jobs_by_ids(db: Session, job_ids: List[int]) -> List[models.Job]:
+    """Get jobs by ID, ordered by ID. Missing IDs are skipped."""
+    jobs = []
+    for start in range(0, len(job_ids), IN_CHUNK_SIZE):
+        chunk = job_ids[start:start + IN_CHUNK_SIZE]
+        jobs.extend(db.query(models.Job).filter(models.Job.id.in_(chunk)).all())
+    jobs.sort(key=lambda j: j.id)
+    return jobs
+
+
+def get_all_jobs(db: Session, skip: int = 0, limit: Optional[int] = 100) -> List[models.Job]:
+    """Get all jobs. Pass `limit=None` for the whole catalogue."""
+    return db.query(models.Job).order_by(models.Job.id).offset(skip).limit(limit).all()
+
+
+def count_jobs(db: Session) -> int:
+    """Get the number of jobs in the catalogue."""
+    return db.query(func.count(models.Job.id)).scalar()
+
+
+def compress_job_descriptions(db: Session, batch_size: int = 500) -> int:
+    """
+    Compress stored descriptions that are over the compression threshold.
+    
+    Content is unchanged, so no change event is logged; the search triggers
+    re-index the affected rows from the decompressed text.
+    
+    Returns:
+        Number of descriptions compressed
+    """
+    candidates = (
+        db.query(models.Job.id)
+        .filter(
+            models.Job.description_z.is_(None),
+            func.length(func.cast(models.Job.stored_description, LargeBinary)) >= compression.COMPRESSION_THRESHOLD
+        )
+        .order_by(models.Job.id)
+    )
+    job_ids = [job_id for (job_id,) in candidates]
+    compressed = 0
+    for start in range(0, len(job_ids), batch_size):
+        for db_job in get_jobs_by_ids(db, job_ids[start:start + batch_size]):
+            db_job.description = db_job.stored_description
+            compressed += db_job.description_z is not None
+        db.commit()
+    return compressed
+
+
+def iter_jobs_by_skill_overlap(
+    db: Session,
+    skills: List[str],
+    batch_size: int = 500
+) -> Iterator[Tuple[int, List[models.Job]]]:
+    """
+    Yield the whole catalogue in batches, jobs sharing the most skills first.
+    
+    Overlaps are counted from the job_skills postings of `skills` only, so the
+    order is known before any job row is read. Jobs sharing no skill follow
+    in ID order and are only read if the caller keeps consuming.
+    
+    Args:
+        db: Database session
+        skills: Candidate skills
+        batch_size: Jobs per batch
+        
+    Yields:
+        (overlap, jobs) pairs, where `overlap` is the largest number of shared
+        skills of any job in this or a later batch
+    """
+    skills = list(dict.fromkeys(skills))
+    if skills:
+        overlap = func.count().label("overlap")
+        ranked = db.execute(
+            select(models.JobSkill.job_id, overlap)
+            .where(models.JobSkill.skill.in_(skills))
+            .group_by(models.JobSkill.job_id)
+            .order_by(overlap.desc(), models.JobSkill.job_id),
+            execution_options={"yield_per": batch_size}
+        )
+        for batch in ranked.partitions():
+            yield batch[0][1], get_jobs_by_ids(db, [job_id for job_id, _ in batch])
+    
+    shares_none = db.query(models.Job).order_by(models.Job.id)
+    if skills:
+        shares_none = shares_none.filter(~db.query(models.JobSkill).filter(
+            models.JobSkill.job_id == models.Job.id,
+            models.JobSkill.skill.in_(skills)
+        ).exists())
+    batch = []
+    for job in shares_none.yield_per(batch_size):
+        batch.append(job)
+        if len(batch) == batch_size:
+            yield 0, batch
+            batch = []
+    if batch:
+        yield 0, batch
+
+
+def count_jobs_by_score_inputs(db: Session, skills: List[str]) -> List[Tuple[int, int, int, int]]:
+    """
+    Count jobs by everything their match score depends on, in one SQL aggregation.
+    
+    Skill counts and overlaps come from the job_skills postings, so no job
+    row is loaded or parsed; the result has one row per distinct combination.
+    
+    Args:
+        db: Database session
+        skills: Candidate skills
+        
+    Returns:
+        List of (overlap, job_skill_count, min_years_experience, job_count) tuples
+    """
+    skill_counts = (
+        select(models.JobSkill.job_id, func.count().label("skill_count"))
+        .group_by(models.JobSkill.job_id)
+        .subquery()
+    )
+    overlaps = (
+        select(models.JobSkill.job_id, func.count().label("overlap"))
+        .where(models.JobSkill.skill.in_(list(dict.fromkeys(skills))))
+        .group_by(models.JobSkill.job_id)
+        .subquery()
+    )
+    overlap = func.coalesce(overlaps.c.overlap, 0)
+    skill_count = func.coalesce(skill_counts.c.skill_count, 0)
+    rows = db.execute(
+        select(overlap, skill_count, models.Job.min_years_experience, func.count())
+        .select_from(models.Job)
+        .outerjoin(skill_counts, skill_counts.c.job_id == models.Job.id)
+        .outerjoin(overlaps, overlaps.c.job_id == models.Job.id)
+        .group_by(overlap, skill_count, models.Job.min_years_experience)
+    )
+    return [tuple(row) for row in rows]
+
+
+def get_jobs_for_matching(
+    db: Session,
+    must_have: Optional[List[str]] = None,
+    max_required_years: Optional[int] = None,
+    title: Optional[str] = None,
+    q: Optional[str] = None
+) -> List[models.Job]:
+    """
+    Get the jobs worth scoring, with every filter applied in one SQL query.
+    
+    Args:
+        db: Database session
+        must_have: Skills a job must require, all of them (job_skills postings)
+        max_required_years: Upper bound on a job's minimum years of experience
+        title: Words that must appear in the job title (FTS5)
+        q: Words that must appear in the title or description (FTS5)
+        
+    Returns:
+        Matching jobs ordered by ID
+    """
+    query = db.query(models.Job)
+    
+    if max_required_years is not None:
+        query = query.filter(models.Job.min_years_experience <= max_required_years)
+    
+    if must_have:
+        skills = list(dict.fromkeys(must_have))
+        postings = (
+            db.query(models.JobSkill.job_id)
+            .filter(models.JobSkill.skill.in_(skills))
+            .group_by(models.JobSkill.job_id)
+            .having(func.count() == len(skills))
+        )
+        query = query.filter(models.Job.id.in_(postings))
+    
+    for text_query, column in ((title, "title"), (q, None)):
+        if text_query is None:
+            continue
+        hits = search.match_ids_subquery(text_query, column)
+        if hits is None:
+            return []  # Nothing searchable, so nothing can match
+        query = query.filter(models.Job.id.in_(hits))
+    
+    return query.order_by(models.Job.id).all()
 
 
 def update_job(db: Session, job_id: int, job_update: schemas.JobUpdate) -> Optional[models.Job]:
@@ -41,10 +571,13 @@ def update_job(db: Session, job_id: int, job_update: schemas.JobUpdate) -> Optio
     if job_update.description is not None:
         db_job.description = job_update.description
     if job_update.required_skills is not None:
+        _update_skill_stats(db, "job", _skill_delta(db_job.get_skills_list(), job_update.required_skills))
         db_job.set_skills_list(job_update.required_skills)
     if job_update.min_years_experience is not None:
         db_job.min_years_experience = job_update.min_years_experience
+    db_job.content_hash = _content_hash(_job_snapshot(db_job))
     
+    record_change(db, "job", "update", db_job.id, _job_change_payload(db_job))
     db.commit()
     db.refresh(db_job)
     return db_job
@@ -56,31 +589,162 @@ def delete_job(db: Session, job_id: int) -> bool:
     if not db_job:
         return False
     
+    _update_skill_stats(db, "job", _skill_delta(db_job.get_skills_list(), []))
+    db.query(models.Notification).filter(models.Notification.job_id == job_id).delete(synchronize_session=False)
     db.delete(db_job)
+    record_change(db, "job", "delete", job_id)
     db.commit()
     return True
 
 
+def _stored_hashes(db: Session, model, external_ids: List[str]) -> Dict[str, Tuple[int, Optional[str]]]:
+    """Map external IDs to (id, content_hash) of the stored rows, reading only those columns."""
+    stored = {}
+    for start in range(0, len(external_ids), IN_CHUNK_SIZE):
+        chunk = external_ids[start:start + IN_CHUNK_SIZE]
+        rows = db.query(model.external_id, model.id, model.content_hash).filter(model.external_id.in_(chunk))
+        stored.update((external_id, (row_id, content_hash)) for external_id, row_id, content_hash in rows)
+    return stored
+
+
+def upsert_jobs(db: Session, jobs: List[schemas.JobUpsert]) -> dict:
+    """
+    Insert or update jobs by `external_id` in one transaction.
+    
+    Items whose content hash matches the stored job are skipped entirely: no
+    write, no change event, so caches keyed on the change sequence stay valid.
+    If an external ID repeats, its last occurrence wins. The upstream feed is
+    the source of identity, so near-duplicate detection does not apply.
+    
+    Returns:
+        Dictionary with `inserted`, `updated` and `unchanged` counts and `ids`,
+        the job ID for each input item in input order
+    """
+    latest = {job.external_id: job for job in jobs}
+    stored = _stored_hashes(db, models.Job, list(latest))
+    
+    new_jobs = []
+    changed = {}  # Job ID -> (upsert item, its content hash)
+    unchanged = 0
+    for external_id, job in latest.items():
+        content_hash = _content_hash(job.model_dump(exclude={"external_id"}))
+        if external_id not in stored:
+            db_job = _new_job(job)
+            db_job.external_id = external_id
+            new_jobs.append(db_job)
+        elif stored[external_id][1] == content_hash:
+            unchanged += 1
+        else:
+            changed[stored[external_id][0]] = (job, content_hash)
+    
+    skill_delta = Counter()
+    updated = []
+    for db_job in get_jobs_by_ids(db, list(changed)):
+        job, content_hash = changed[db_job.id]
+        if _content_hash(_job_snapshot(db_job)) == content_hash:
+            db_job.content_hash = content_hash  # Row predates content hashes
+            unchanged += 1
+            continue
+        skill_delta.update(_skill_delta(db_job.get_skills_list(), job.required_skills))
+        db_job.title = job.title
+        db_job.description = job.description
+        db_job.set_skills_list(job.required_skills)
+        db_job.min_years_experience = job.min_years_experience
+        db_job.content_hash = content_hash
+        record_change(db, "job", "update", db_job.id, _job_change_payload(db_job))
+        updated.append(db_job)
+    
+    db.add_all(new_jobs)
+    db.flush()
+    if new_jobs:
+        record_change(db, "job", "bulk_create", payload={"ids": [j.id for j in new_jobs]})
+    _queue_percolation(db, [j.id for j in new_jobs])
+    for db_job in new_jobs:
+        skill_delta.update(set(db_job.get_skills_list()))
+    _update_skill_stats(db, "job", skill_delta)
+    ids_by_external_id = {external_id: row_id for external_id, (row_id, _) in stored.items()}
+    ids_by_external_id.update((j.external_id, j.id) for j in new_jobs)
+    db.commit()
+    return {
+        "inserted": len(new_jobs),
+        "updated": len(updated),
+        "unchanged": unchanged,
+        "ids": [ids_by_external_id[job.external_id] for job in jobs],
+    }
+
+
 # Candidate CRUD operations
-def create_candidate(db: Session, candidate: schemas.CandidateCreate) -> models.Candidate:
-    """Create a new candidate."""
+def _new_candidate(candidate: schemas.CandidateBase) -> models.Candidate:
+    """Build an unsaved Candidate from a create or upsert schema (without an alert threshold)."""
     db_candidate = models.Candidate(
         name=candidate.name,
         years_experience=candidate.years_experience
     )
     db_candidate.set_skills_list(candidate.skills)
+    db_candidate.content_hash = _content_hash(_candidate_snapshot(db_candidate))
+    return db_candidate
+
+
+def create_candidate(db: Session, candidate: schemas.CandidateCreate) -> models.Candidate:
+    """Create a new candidate."""
+    db_candidate = _new_candidate(candidate)
+    db_candidate.alert_threshold = candidate.alert_threshold
     
     db.add(db_candidate)
+    db.flush()
+    record_change(db, "candidate", "create", db_candidate.id, _candidate_snapshot(db_candidate))
+    _update_skill_stats(db, "candidate", _skill_delta([], candidate.skills))
     db.commit()
     db.refresh(db_candidate)
     return db_candidate
 
 
+def create_candidates(
+    db: Session,
+    candidates: List[schemas.CandidateCreate],
+    commit: bool = True
+) -> List[models.Candidate]:
+    """
+    Create several candidates in one transaction, logged as a single batched event.
+    
+    Pass commit=False to flush only, leaving the commit to the caller's transaction.
+    """
+    db_candidates = [_new_candidate(candidate) for candidate in candidates]
+    for db_candidate, candidate in zip(db_candidates, candidates):
+        db_candidate.alert_threshold = candidate.alert_threshold
+    
+    db.add_all(db_candidates)
+    db.flush()
+    new_ids = [c.id for c in db_candidates]
+    if new_ids:
+        record_change(db, "candidate", "bulk_create", payload={"ids": new_ids})
+    _update_skill_stats(db, "candidate", Counter(
+        skill for candidate in candidates for skill in set(candidate.skills)
+    ))
+    if not commit:
+        db.flush()
+        return db_candidates
+    db.commit()
+    return get_candidates_by_ids(db, new_ids)
+
+
 def get_candidate(db: Session, candidate_id: int) -> Optional[models.Candidate]:
     """Get a candidate by ID."""
     return db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
 
 
+def get_candidates_by_ids(db: Session, candidate_ids: List[int]) -> List[models.Candidate]:
+    """Get candidates by ID, ordered by ID. Missing IDs are skipped."""
+    candidates = []
+    for start in range(0, len(candidate_ids), IN_CHUNK_SIZE):
+        chunk = candidate_ids[start:start + IN_CHUNK_SIZE]
+        candidates.extend(
+            db.query(models.Candidate).filter(models.Candidate.id.in_(chunk)).all()
+        )
+    candidates.sort(key=lambda c: c.id)
+    return candidates
+
+
 def update_candidate(
     db: Session, 
     candidate_id: int, 
@@ -94,10 +758,17 @@ def update_candidate(
     if candidate_update.name is not None:
         db_candidate.name = candidate_update.name
     if candidate_update.skills is not None:
+        _update_skill_stats(
+            db, "candidate", _skill_delta(db_candidate.get_skills_list(), candidate_update.skills)
+        )
         db_candidate.set_skills_list(candidate_update.skills)
     if candidate_update.years_experience is not None:
         db_candidate.years_experience = candidate_update.years_experience
+    if "alert_threshold" in candidate_update.model_fields_set:  # An explicit null disables alerts
+        db_candidate.alert_threshold = candidate_update.alert_threshold
+    db_candidate.content_hash = _content_hash(_candidate_snapshot(db_candidate))
     
+    record_change(db, "candidate", "update", db_candidate.id, _candidate_snapshot(db_candidate))
     db.commit()
     db.refresh(db_candidate)
     return db_candidate
@@ -109,7 +780,73 @@ def delete_candidate(db: Session, candidate_id: int) -> bool:
     if not db_candidate:
         return False
     
+    _update_skill_stats(db, "candidate", _skill_delta(db_candidate.get_skills_list(), []))
+    db.query(models.Notification).filter(
+        models.Notification.candidate_id == candidate_id
+    ).delete(synchronize_session=False)
     db.delete(db_candidate)
+    record_change(db, "candidate", "delete", candidate_id)
     db.commit()
     return True
 
+
+def upsert_candidates(db: Session, candidates: List[schemas.CandidateUpsert]) -> dict:
+    """
+    Insert or update candidates by `external_id` in one transaction.
+    
+    Unchanged candidates are skipped as in upsert_jobs.
+    
+    Returns:
+        Dictionary with `inserted`, `updated` and `unchanged` counts and `ids`,
+        the candidate ID for each input item in input order
+    """
+    latest = {candidate.external_id: candidate for candidate in candidates}
+    stored = _stored_hashes(db, models.Candidate, list(latest))
+    
+    new_candidates = []
+    changed = {}  # Candidate ID -> (upsert item, its content hash)
+    unchanged = 0
+    for external_id, candidate in latest.items():
+        content_hash = _content_hash(candidate.model_dump(exclude={"external_id"}))
+        if external_id not in stored:
+            db_candidate = _new_candidate(candidate)
+            db_candidate.external_id = external_id
+            new_candidates.append(db_candidate)
+        elif stored[external_id][1] == content_hash:
+            unchanged += 1
+        else:
+            changed[stored[external_id][0]] = (candidate, content_hash)
+    
+    skill_delta = Counter()
+    updated = 0
+    for db_candidate in get_candidates_by_ids(db, list(changed)):
+        candidate, content_hash = changed[db_candidate.id]
+        if _content_hash(_candidate_snapshot(db_candidate)) == content_hash:
+            db_candidate.content_hash = content_hash  # Row predates content hashes
+            unchanged += 1
+            continue
+        skill_delta.update(_skill_delta(db_candidate.get_skills_list(), candidate.skills))
+        db_candidate.name = candidate.name
+        db_candidate.set_skills_list(candidate.skills)
+        db_candidate.years_experience = candidate.years_experience
+        db_candidate.content_hash = content_hash
+        record_change(db, "candidate", "update", db_candidate.id, _candidate_snapshot(db_candidate))
+        updated += 1
+    
+    db.add_all(new_candidates)
+    db.flush()
+    if new_candidates:
+        record_change(db, "candidate", "bulk_create", payload={"ids": [c.id for c in new_candidates]})
+    for db_candidate in new_candidates:
+        skill_delta.update(set(db_candidate.get_skills_list()))
+    _update_skill_stats(db, "candidate", skill_delta)
+    ids_by_external_id = {external_id: row_id for external_id, (row_id, _) in stored.items()}
+    ids_by_external_id.update((c.external_id, c.id) for c in new_candidates)
+    db.commit()
+    return {
+        "inserted": len(new_candidates),
+        "updated": updated,
+        "unchanged": unchanged,
+        "ids": [ids_by_external_id[candidate.external_id] for candidate in candidates],
+    }
+
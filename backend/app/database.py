@@ -1,6 +1,7 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker
+from app.compression import sqlite_zdecompress
 import os
 
 # SQLite database file path
@@ -12,6 +13,16 @@ engine = create_engine(
     connect_args={"check_same_thread": False}  # Needed for SQLite
 )
 
+
+@event.listens_for(engine, "connect")
+def _register_sql_functions(dbapi_connection, connection_record):
+    """Register the app's SQL functions (used by the search triggers) on every connection."""
+    dbapi_connection.create_function("zdecompress", 1, sqlite_zdecompress, deterministic=True)
+
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -30,5 +41,46 @@ def get_db():
 
 def init_db():
     """Initialize database tables."""
+    from app import models  # noqa: F401  # Register models on Base before creating tables
+    from app.search import ensure_search_index
     Base.metadata.create_all(bind=engine)
+    added = migrate_db()
+    ensure_search_index(engine)
+    if "jobs.description_z" in added:
+        # Compress descriptions stored before compression existed
+        from app.crud import compress_job_descriptions
+        db = SessionLocal()
+        try:
+            compress_job_descriptions(db)
+        finally:
+            db.close()
+
+
+def migrate_db():
+    """
+    Bring tables created by an older version up to date.
+    
+    create_all() only creates missing tables, so columns added to existing
+    models are added here with ALTER TABLE, together with their indexes.
+    New columns must therefore be nullable or have a server default.
+    
+    Returns:
+        The added columns as "table.column" names
+    """
+    added = []
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+                added.append(f"{table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+    return added
 
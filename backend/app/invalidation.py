@@ -0,0 +1,169 @@
+"""Cross-worker invalidation: follow the change log and refresh in-process state."""
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app import models
+from app.database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+# How often the background thread checks for writes by other workers (0 disables it;
+# readers still catch up on demand)
+POLL_INTERVAL_SECONDS = float(os.getenv("CATALOGUE_POLL_INTERVAL", "1.0"))
+
+# Change events applied per listener call
+PAGE_SIZE = 1000
+
+
+class ChangeListener(ABC):
+    """In-process state derived from the catalogue, kept current by the watcher."""
+
+    @abstractmethod
+    def apply(self, db: Session, changes: List[models.ChangeEvent]) -> None:
+        """Apply committed change events, oldest first (replays must be harmless)."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop all state; it is rebuilt from the database on next use."""
+
+
+class CatalogueWatcher:
+    """
+    Follows the `changes` table and feeds new events to subscribed listeners.
+
+    Every write from any worker process appends to the change log in its own
+    transaction, so the log's sequence number is a catalogue version shared
+    through the SQLite file alone. Polling is gated on `PRAGMA data_version`,
+    which changes only when some connection commits, so an idle check reads
+    no pages. If the log no longer contains the last applied event (the
+    database was replaced or recreated), listeners are reset instead.
+    """
+
+    def __init__(self):
+        self._listeners: List[ChangeListener] = []
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None  # Outside the pool; only reads data_version
+        self._data_version: Optional[int] = None
+        self._anchor: Optional[Tuple[int, datetime]] = None  # (seq, created_at) of the last applied event
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the last change applied to listeners."""
+        return self._anchor[0] if self._anchor else 0
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Register a listener for change events and resets."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _read_data_version(self) -> int:
+        if self._conn is None:
+            # A plain sqlite3 connection, so the watcher never holds one of the pool's
+            self._conn = sqlite3.connect(engine.url.database, check_same_thread=False)
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def poll(self) -> int:
+        """
+        Apply any changes committed since the last poll.
+
+        Cheap enough to call on read paths before using derived state.
+
+        Returns:
+            Sequence number the listeners now reflect
+        """
+        with self._lock:
+            data_version = self._read_data_version()
+            if data_version == self._data_version:
+                return self.seq
+            db = SessionLocal()
+            try:
+                self._catch_up(db)
+            finally:
+                db.close()
+            self._data_version = data_version
+            return self.seq
+
+    def _catch_up(self, db: Session) -> None:
+        if self._anchor is None or not self._anchor_present(db):
+            self._reset(db)
+            return
+        while True:
+            changes = (
+                db.query(models.ChangeEvent)
+                .filter(models.ChangeEvent.seq > self._anchor[0])
+                .order_by(models.ChangeEvent.seq)
+                .limit(PAGE_SIZE)
+                .all()
+            )
+            if not changes:
+                return
+            for listener in self._listeners:
+                listener.apply(db, changes)
+            self._anchor = (changes[-1].seq, changes[-1].created_at)
+
+    def _anchor_present(self, db: Session) -> bool:
+        seq, created_at = self._anchor
+        if seq == 0:
+            return True
+        stored = db.query(models.ChangeEvent.created_at).filter(models.ChangeEvent.seq == seq).scalar()
+        return stored == created_at
+
+    def _reset(self, db: Session) -> None:
+        """Start over from the database's current state."""
+        latest = db.query(func.max(models.ChangeEvent.seq)).scalar() or 0
+        created_at = None
+        if latest:
+            created_at = db.query(models.ChangeEvent.created_at).filter(models.ChangeEvent.seq == latest).scalar()
+        for listener in self._listeners:
+            listener.reset()
+        if self._anchor is not None:
+            logger.info("Change log moved from seq %s to %s; reset in-process state", self.seq, latest)
+        self._anchor = (latest, created_at)
+
+    def start(self, interval: float) -> None:
+        """Poll in a background thread so state is warm before requests need it."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="catalogue-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Catalogue watcher poll failed")
+
+    def stop(self) -> None:
+        """Stop the background thread and release the connection."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._data_version = None
+
+
+# Process-wide watcher shared by all in-process caches and indexes
+watcher = CatalogueWatcher()
+
+
+def start_watcher() -> None:
+    """Start background polling (no-op if CATALOGUE_POLL_INTERVAL is 0)."""
+    if POLL_INTERVAL_SECONDS > 0:
+        watcher.start(POLL_INTERVAL_SECONDS)
+
+
+def stop_watcher() -> None:
+    """Stop background polling."""
+    watcher.stop()
@@ -3,7 +3,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.database import init_db
-from app.routers import jobs, candidates, matches
+from app.sharding import shutdown_matcher, start_matcher
+from app.invalidation import start_watcher, stop_watcher
+from app.similarity import start_job_index
+from app.tasks import start_workers, stop_workers
+from app.routers import jobs, candidates, matches, changes, stats, tasks
 import os
 
 # Initialize FastAPI app
@@ -20,19 +24,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[  # Read by the jobs view and API clients
+        "X-Change-Seq", "X-Total-Count", "ETag", "X-Catalogue-Size", "X-Candidate-Set-Size",
+        "Retry-After", "X-Match-Exact", "X-Jobs-Examined"
+    ],
 )
 
 # Initialize database on startup
 @app.on_event("startup")
 def startup_event():
-    """Initialize database tables on application startup."""
+    """Initialize database tables and start background threads, shard workers and the similarity index build."""
     init_db()
+    start_watcher()
+    start_job_index()
+    start_workers()
+    start_matcher()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop background worker processes and threads."""
+    stop_workers()
+    stop_watcher()
+    shutdown_matcher()
 
 
 # Include routers
 app.include_router(jobs.router)
 app.include_router(candidates.router)
 app.include_router(matches.router)
+app.include_router(changes.router)
+app.include_router(stats.router)
+app.include_router(tasks.router)
 
 # Serve static files (frontend) if directory exists
 # Try multiple possible paths for frontend
@@ -1,5 +1,7 @@
 """Match algorithm implementation."""
-from typing import List
+import heapq
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from app.models import Job, Candidate
 
 
@@ -22,19 +24,48 @@ def calculate_match_score(candidate: Candidate, job: Job) -> int:
     candidate_skills = set(candidate.get_skills_list())
     job_skills = set(job.get_skills_list())
     
+    return score_from_counts(
+        len(candidate_skills.intersection(job_skills)),
+        len(job_skills),
+        candidate.years_experience,
+        job.min_years_experience
+    )
+
+
+def score_from_counts(
+    overlap: int,
+    job_skill_count: int,
+    years_experience: int,
+    min_years_experience: int
+) -> int:
+    """
+    Calculate a match score from pre-computed inputs.
+    
+    Same formula as calculate_match_score, for callers that already know the
+    skill overlap (e.g. from parsed or indexed data) and want to skip
+    building model objects.
+    
+    Args:
+        overlap: Number of distinct required skills the candidate has
+        job_skill_count: Number of distinct required skills
+        years_experience: Candidate's years of experience
+        min_years_experience: Job's minimum years of experience
+        
+    Returns:
+        Match score from 0 to 100
+    """
     # Calculate skill match ratio
-    if not job_skills:
+    if not job_skill_count:
         skill_match_ratio = 0.0
     else:
-        overlapping_skills = candidate_skills.intersection(job_skills)
-        skill_match_ratio = len(overlapping_skills) / len(job_skills)
+        skill_match_ratio = overlap / job_skill_count
     
     # Calculate experience match ratio
-    if job.min_years_experience == 0:
+    if min_years_experience == 0:
         experience_match_ratio = 1.0
     else:
         experience_match_ratio = min(
-            candidate.years_experience / job.min_years_experience,
+            years_experience / min_years_experience,
             1.0
         )
     
@@ -46,31 +77,198 @@ def calculate_match_score(candidate: Candidate, job: Job) -> int:
     return match_score
 
 
-def get_job_matches(candidate: Candidate, jobs: List[Job]) -> List[dict]:
+def build_job_match(candidate: Candidate, job: Job) -> dict:
+    """
+    Score a single job for a candidate.
+    
+    Args:
+        candidate: Candidate object
+        job: Job object
+        
+    Returns:
+        Dictionary with job info and match score
+    """
+    return {
+        "jobId": job.id,
+        "title": job.title,
+        "requiredSkills": job.get_skills_list(),
+        "minYearsExperience": job.min_years_experience,
+        "matchScore": calculate_match_score(candidate, job)
+    }
+
+
+def get_job_matches(
+    candidate: Candidate,
+    jobs: List[Job],
+    top_k: Optional[int] = None
+) -> List[dict]:
     """
     Get all jobs with match scores for a candidate, sorted by score descending.
     
     Args:
         candidate: Candidate object
         jobs: List of all job objects
+        top_k: If given, only the best `top_k` matches are returned
         
     Returns:
         List of dictionaries with job info and match score, sorted by score
     """
-    matches = []
+    matches = [build_job_match(candidate, job) for job in jobs]
     
-    for job in jobs:
-        match_score = calculate_match_score(candidate, job)
-        matches.append({
-            "jobId": job.id,
-            "title": job.title,
-            "requiredSkills": job.get_skills_list(),
-            "minYearsExperience": job.min_years_experience,
-            "matchScore": match_score
-        })
+    if top_k is not None:
+        # Equivalent to a stable sort truncated to top_k, without sorting everything
+        return heapq.nsmallest(top_k, matches, key=lambda x: -x["matchScore"])
     
     # Sort by match score descending
     matches.sort(key=lambda x: x["matchScore"], reverse=True)
     
     return matches
 
+
+
+def get_job_matches_until(
+    candidate: Candidate,
+    batches: Iterable[Tuple[int, List[Job]]],
+    deadline: float,
+    top_k: Optional[int] = None
+) -> Tuple[List[dict], int, bool]:
+    """
+    Score jobs batch by batch in priority order until a deadline passes.
+    
+    The first batch is always scored. Scoring stops early, with an exact
+    result, once `top_k` matches beat anything the remaining batches could
+    score (jobs sharing no skill score at most 30).
+    
+    Args:
+        candidate: Candidate object
+        batches: (overlap, jobs) pairs, most promising first, where `overlap`
+            bounds the shared skills of jobs in that and later batches
+        deadline: time.monotonic() value after which no new batch is started
+        top_k: If given, only the best `top_k` matches are returned
+        
+    Returns:
+        Matches sorted by score descending (ties by job ID), the number of
+        jobs scored, and whether the result equals the exhaustive one
+    """
+    matches = []
+    best_scores = []  # Min-heap of the top_k scores so far
+    exact = True
+    for overlap, jobs in batches:
+        if matches:
+            bound = score_from_counts(overlap, max(overlap, 1), candidate.years_experience, 0)
+            if top_k is not None and len(best_scores) == top_k and best_scores[0] > bound:
+                break
+            if time.monotonic() >= deadline:
+                exact = False
+                break
+        for job in jobs:
+            match = build_job_match(candidate, job)
+            matches.append(match)
+            if top_k is not None:
+                if len(best_scores) < top_k:
+                    heapq.heappush(best_scores, match["matchScore"])
+                elif match["matchScore"] > best_scores[0]:
+                    heapq.heapreplace(best_scores, match["matchScore"])
+    
+    def key(match):
+        return -match["matchScore"], match["jobId"]
+    ranked = heapq.nsmallest(top_k, matches, key=key) if top_k is not None else sorted(matches, key=key)
+    return ranked, len(matches), exact
+
+
+def summarize_scores(
+    groups: Iterable[Tuple[int, int, int, int]],
+    years_experience: int,
+    bucket_size: int = 10,
+    thresholds: Iterable[int] = ()
+) -> Tuple[List[int], Dict[int, int]]:
+    """
+    Build a score histogram and threshold counts from grouped score inputs.
+    
+    Each group is scored once and weighted by its job count, so the cost
+    depends on the number of distinct (overlap, skill count, years) groups,
+    not on the catalogue size.
+    
+    Args:
+        groups: (overlap, job_skill_count, min_years_experience, job_count) tuples
+        years_experience: Candidate's years of experience
+        bucket_size: Width of each histogram bucket in score points
+        thresholds: Scores to count matches at or above
+        
+    Returns:
+        Job counts per bucket (bucket i covers scores from i * bucket_size;
+        the last one also includes 100), and a count per threshold
+    """
+    histogram = [0] * (100 // bucket_size + (100 % bucket_size > 0))
+    thresholds = sorted(set(thresholds))
+    at_or_above = dict.fromkeys(thresholds, 0)
+    for overlap, job_skill_count, min_years_experience, job_count in groups:
+        score = score_from_counts(overlap, job_skill_count, years_experience, min_years_experience)
+        histogram[min(score // bucket_size, len(histogram) - 1)] += job_count
+        for threshold in thresholds:
+            if score < threshold:
+                break
+            at_or_above[threshold] += job_count
+    return histogram, at_or_above
+
+
+class CatalogueScorer:
+    """
+    Scores candidates against a fixed catalogue, for bulk exports.
+    
+    Jobs are parsed once into an inverted skill index, so a candidate's
+    overlaps come from the postings of their own skills, and each distinct
+    (overlap, skill count, min years) combination is scored once per
+    candidate. With a score floor above 30 only jobs sharing a skill are
+    visited.
+    """
+    
+    def __init__(self, jobs: Iterable[Tuple[int, List[str], int]]):
+        """
+        Args:
+            jobs: (job_id, required_skills, min_years_experience) tuples, in output order
+        """
+        self.job_ids: List[int] = []
+        self._shape_of: List[int] = []  # Per job: index into self._shapes
+        self._postings: Dict[str, List[int]] = {}  # Skill -> positions of the jobs requiring it
+        shapes: Dict[Tuple[int, int], int] = {}  # (distinct skill count, min years) -> index
+        for position, (job_id, skills, min_years_experience) in enumerate(jobs):
+            distinct = set(skills)
+            self.job_ids.append(job_id)
+            self._shape_of.append(shapes.setdefault((len(distinct), min_years_experience), len(shapes)))
+            for skill in distinct:
+                self._postings.setdefault(skill, []).append(position)
+        self._shapes = list(shapes)
+    
+    def __len__(self) -> int:
+        return len(self.job_ids)
+    
+    def score(self, skills: List[str], years_experience: int, min_score: int = 0) -> Iterator[Tuple[int, int]]:
+        """
+        Score the catalogue for one candidate.
+        
+        Args:
+            skills: Candidate skills
+            years_experience: Candidate's years of experience
+            min_score: Only yield jobs scoring at least this
+            
+        Yields:
+            (job_id, match_score) pairs in catalogue order
+        """
+        overlaps: Dict[int, int] = {}
+        for skill in set(skills):
+            for position in self._postings.get(skill, ()):
+                overlaps[position] = overlaps.get(position, 0) + 1
+        tables = [
+            [score_from_counts(overlap, count, years_experience, min_years) for overlap in range(count + 1)]
+            for count, min_years in self._shapes
+        ]
+        if min_score > score_from_counts(0, 1, years_experience, 0):  # Best score without a shared skill
+            positions = sorted(overlaps)
+        else:
+            positions = range(len(self.job_ids))
+        job_ids, shape_of = self.job_ids, self._shape_of
+        for position in positions:
+            score = tables[shape_of[position]][overlaps.get(position, 0)]
+            if score >= min_score:
+                yield job_ids[position], score
@@ -1,42 +1,261 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, event, func
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship
+from app import compression, search
 from app.database import Base
+from datetime import datetime
 import json
 
 
 class Job(Base):
     """Job model."""
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Serves "required years <= x" filters without touching the table rows
+        Index("ix_jobs_min_years_experience_id", "min_years_experience", "id"),
+        # A unique index rather than a column constraint, so migrate_db can add it
+        Index("ix_jobs_external_id", "external_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    description = Column(Text, nullable=False)
+    # Long descriptions live zlib-compressed in description_z, leaving the text column empty
+    stored_description = Column("description", Text, nullable=False)
+    description_z = Column(LargeBinary, nullable=True)
     required_skills = Column(Text, nullable=False)  # Stored as JSON string
     min_years_experience = Column(Integer, nullable=False)
+    duplicate_of = Column(Integer, nullable=True, index=True)  # Near-duplicate of this job ID
+    external_id = Column(String, nullable=True)  # ID in the upstream feed, for upserts
+    content_hash = Column(String, nullable=True)  # Hash of the content fields, to skip no-op upserts
+
+    # One row per distinct required skill, for index-backed skill filters
+    skill_postings = relationship("JobSkill", cascade="all, delete-orphan")
+
+    @hybrid_property
+    def description(self):
+        """Job description, decompressed on access."""
+        if self.description_z is not None:
+            return compression.decompress_text(self.description_z)
+        return self.stored_description
+
+    @description.inplace.setter
+    def _description_setter(self, value):
+        self.description_z = compression.compress_text(value)
+        self.stored_description = "" if self.description_z is not None else value
+
+    @description.inplace.expression
+    @classmethod
+    def _description_expression(cls):
+        return func.coalesce(func.zdecompress(cls.description_z), cls.stored_description)
 
     def get_skills_list(self):
         """Convert skills JSON string to list."""
         return json.loads(self.required_skills) if self.required_skills else []
 
     def set_skills_list(self, skills):
-        """Convert skills list to JSON string."""
+        """Convert skills list to JSON string and sync the skill postings."""
         self.required_skills = json.dumps(skills) if skills else "[]"
+        existing = {posting.skill: posting for posting in self.skill_postings}
+        self.skill_postings = [
+            existing.get(skill) or JobSkill(skill=skill)
+            for skill in dict.fromkeys(skills or [])
+        ]
+
+
+class JobSkill(Base):
+    """Skill posting: links a job to one of its required skills."""
+    __tablename__ = "job_skills"
+    __table_args__ = (
+        Index("ix_job_skills_skill_job_id", "skill", "job_id"),
+    )
+
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String, primary_key=True)
+
+
+# Keep the FTS5 index in step with the jobs table
+event.listen(Job.__table__, "after_create", search.create_search_index)
+event.listen(Job.__table__, "before_drop", search.drop_search_index)
+
+# Backfill postings when the table is added to a database that already has jobs
+event.listen(JobSkill.__table__, "after_create", DDL(
+    "INSERT OR IGNORE INTO job_skills (job_id, skill) "
+    "SELECT jobs.id, json_each.value FROM jobs, json_each(jobs.required_skills)"
+))
 
 
 class Candidate(Base):
     """Candidate model."""
     __tablename__ = "candidates"
+    __table_args__ = (
+        Index("ix_candidates_external_id", "external_id", unique=True),
+        # Serves the percolator's low-threshold lookup, which needs no skill overlap
+        Index("ix_candidates_alert_threshold_years_experience", "alert_threshold", "years_experience"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     skills = Column(Text, nullable=False)  # Stored as JSON string
     years_experience = Column(Integer, nullable=False)
+    external_id = Column(String, nullable=True)  # ID in the upstream feed, for upserts
+    content_hash = Column(String, nullable=True)  # Hash of the content fields, to skip no-op upserts
+    alert_threshold = Column(Integer, nullable=True)  # Notify on new jobs scoring at least this; None disables
+
+    # One row per distinct skill, the reverse index new jobs are percolated through
+    skill_postings = relationship("CandidateSkill", cascade="all, delete-orphan")
 
     def get_skills_list(self):
         """Convert skills JSON string to list."""
         return json.loads(self.skills) if self.skills else []
 
     def set_skills_list(self, skills):
-        """Convert skills list to JSON string."""
+        """Convert skills list to JSON string and sync the skill postings."""
         self.skills = json.dumps(skills) if skills else "[]"
+        existing = {posting.skill: posting for posting in self.skill_postings}
+        self.skill_postings = [
+            existing.get(skill) or CandidateSkill(skill=skill)
+            for skill in dict.fromkeys(skills or [])
+        ]
+
+
+class CandidateSkill(Base):
+    """Skill posting: links a candidate to one of their skills."""
+    __tablename__ = "candidate_skills"
+    __table_args__ = (
+        Index("ix_candidate_skills_skill_candidate_id", "skill", "candidate_id"),
+    )
+
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String, primary_key=True)
+
+
+# Backfill postings when the table is added to a database that already has candidates
+event.listen(CandidateSkill.__table__, "after_create", DDL(
+    "INSERT OR IGNORE INTO candidate_skills (candidate_id, skill) "
+    "SELECT candidates.id, json_each.value FROM candidates, json_each(candidates.skills)"
+))
+
+
+class Notification(Base):
+    """A new job that met a candidate's alert threshold, written by the percolator."""
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # One notification per job and candidate, so a retried percolation is harmless
+        Index("ix_notifications_candidate_id_job_id", "candidate_id", "job_id", unique=True),
+        # Serves a candidate's feed in ID order
+        Index("ix_notifications_candidate_id_id", "candidate_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    match_score = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class SkillStat(Base):
+    """Per-skill demand (jobs) and supply (candidates) counters, maintained by crud."""
+    __tablename__ = "skill_stats"
+
+    skill = Column(String, primary_key=True)
+    job_count = Column(Integer, nullable=False, default=0)  # Jobs requiring the skill
+    candidate_count = Column(Integer, nullable=False, default=0)  # Candidates listing the skill
+    gap = Column(Integer, nullable=False, default=0)  # job_count - candidate_count
+
+
+# Serve the top-N queries of GET /stats/skills straight from an index
+Index("ix_skill_stats_job_count_skill", SkillStat.job_count.desc(), SkillStat.skill)
+Index("ix_skill_stats_candidate_count_skill", SkillStat.candidate_count.desc(), SkillStat.skill)
+Index("ix_skill_stats_gap_skill", SkillStat.gap.desc(), SkillStat.skill)
+
+# Recount every skill from scratch (each job or candidate counts a skill once)
+SKILL_STATS_BACKFILL = (
+    "INSERT INTO skill_stats (skill, job_count, candidate_count, gap) "
+    "SELECT skill, SUM(is_job), SUM(1 - is_job), SUM(2 * is_job - 1) FROM ("
+    "SELECT DISTINCT jobs.id, json_each.value AS skill, 1 AS is_job FROM jobs, json_each(jobs.required_skills) "
+    "UNION ALL "
+    "SELECT DISTINCT candidates.id, json_each.value, 0 FROM candidates, json_each(candidates.skills)"
+    ") GROUP BY skill"
+)
+
+# Backfill counters when the table is added to a database that already has rows
+event.listen(SkillStat.__table__, "after_create", DDL(SKILL_STATS_BACKFILL))
+
+
+
+class ChangeEvent(Base):
+    """Append-only change log entry, written in the same transaction as the mutation."""
+    __tablename__ = "changes"
+    __table_args__ = {"sqlite_autoincrement": True}  # Never reuse sequence numbers
+
+    seq = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)  # "job" or "candidate"
+    entity_id = Column(Integer, nullable=True)  # None for batched events
+    op = Column(String, nullable=False)  # "create", "update", "delete" or "bulk_create"
+    payload = Column(Text, nullable=True)  # Stored as JSON string
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def get_payload(self):
+        """Convert payload JSON string to a Python object."""
+        return json.loads(self.payload) if self.payload else None
+
+    def set_payload(self, payload):
+        """Convert payload to JSON string."""
+        self.payload = json.dumps(payload) if payload is not None else None
+
+
+class Task(Base):
+    """Background task, claimed and run by the task worker pool."""
+    __tablename__ = "tasks"
+    __table_args__ = (
+        # Serves the worker's "next runnable task" lookup
+        Index("ix_tasks_status_run_after_id", "status", "run_after", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    params = Column(Text, nullable=False, default="{}")  # Stored as JSON string
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    progress = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    result = Column(Text, nullable=True)  # Stored as JSON string
+    checkpoint = Column(Text, nullable=True)  # Handler's resume state as JSON, committed with the work it covers
+    error = Column(Text, nullable=True)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)  # Retry backoff
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def get_params(self):
+        """Convert params JSON string to dict."""
+        return json.loads(self.params) if self.params else {}
+
+    def set_params(self, params):
+        """Convert params dict to JSON string."""
+        self.params = json.dumps(params or {})
+
+    def get_checkpoint(self):
+        """Convert checkpoint JSON string to a Python object."""
+        return json.loads(self.checkpoint) if self.checkpoint else None
+
+    def get_result(self):
+        """Convert result JSON string to a Python object."""
+        return json.loads(self.result) if self.result else None
+
+    def set_result(self, result):
+        """Convert result to JSON string."""
+        self.result = json.dumps(result) if result is not None else None
+
+
+class TaskMatch(Base):
+    """One of a candidate's top matches, written by a recompute_matches task."""
+    __tablename__ = "task_matches"
 
+    # The key serves reading a task's matches by candidate, best first
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    candidate_id = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 is the best match
+    job_id = Column(Integer, nullable=False)
+    match_score = Column(Integer, nullable=False)
@@ -1,6 +1,8 @@
 """Candidate CRUD endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from typing import List
 from app import crud, schemas
 from app.database import get_db
 
@@ -13,6 +15,28 @@ def create_candidate(candidate: schemas.CandidateCreate, db: Session = Depends(g
     return crud.create_candidate(db=db, candidate=candidate)
 
 
+@router.post("/bulk", response_model=List[schemas.CandidateResponse], status_code=status.HTTP_201_CREATED)
+def create_candidates(candidates: List[schemas.CandidateCreate], db: Session = Depends(get_db)):
+    """Create several candidates in one transaction."""
+    return crud.create_candidates(db=db, candidates=candidates)
+
+
+@router.put("/upsert", response_model=schemas.UpsertResult)
+def upsert_candidates(candidates: List[schemas.CandidateUpsert], db: Session = Depends(get_db)):
+    """
+    Insert or update candidates by `external_id` in one transaction.
+    Items whose content is unchanged are skipped without writing or logging a change.
+    """
+    try:
+        return crud.upsert_candidates(db=db, candidates=candidates)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A concurrent upsert inserted the same external_id; retry the request"
+        )
+
+
 @router.get("/{candidate_id}", response_model=schemas.CandidateResponse)
 def get_candidate(candidate_id: int, db: Session = Depends(get_db)):
     """Get a specific candidate by ID."""
@@ -25,6 +49,22 @@ def get_candidate(candidate_id: int, db: Session = Depends(get_db)):
     return candidate
 
 
+@router.get("/{candidate_id}/notifications", response_model=List[schemas.Notification])
+def get_notifications(
+    candidate_id: int,
+    since: int = Query(0, ge=0, description="Only notifications with a greater ID"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Get new jobs that met the candidate's alert threshold, oldest first."""
+    if crud.get_candidate(db=db, candidate_id=candidate_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidate with id {candidate_id} not found"
+        )
+    return crud.get_notifications(db=db, candidate_id=candidate_id, since=since, limit=limit)
+
+
 @router.put("/{candidate_id}", response_model=schemas.CandidateResponse)
 def update_candidate(
     candidate_id: int,
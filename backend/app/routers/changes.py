@@ -0,0 +1,33 @@
+"""Change feed endpoints."""
+from fastapi import APIRouter, Query
+from app import schemas
+from app.changefeed import wait_for_changes
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=schemas.ChangeFeed)
+async def get_changes(
+    since: int = Query(0, ge=0, description="Return changes with a sequence number above this"),
+    limit: int = Query(100, ge=1, le=1000),
+    wait: float = Query(0, ge=0, le=60, description="Seconds to long-poll when no changes are available")
+):
+    """
+    Get job and candidate changes in commit order.
+    Consumers store `next_since` and pass it back to receive only newer changes.
+    """
+    changes = await wait_for_changes(since=since, limit=limit, timeout=wait)
+    return schemas.ChangeFeed(
+        changes=[
+            schemas.ChangeEvent(
+                seq=change.seq,
+                entity=change.entity,
+                entity_id=change.entity_id,
+                op=change.op,
+                data=change.get_payload(),
+                created_at=change.created_at
+            )
+            for change in changes
+        ],
+        next_since=changes[-1].seq if changes else since
+    )
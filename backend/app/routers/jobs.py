@@ -1,17 +1,54 @@
 """Job CRUD endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from app import crud, schemas
+from typing import List, Literal, Optional
+from app import crud, schemas, search, similarity
 from app.database import get_db
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
+DuplicatePolicy = Literal["allow", "flag", "merge"]
+
+
 @router.post("", response_model=schemas.JobResponse, status_code=status.HTTP_201_CREATED)
-def create_job(job: schemas.JobCreate, db: Session = Depends(get_db)):
-    """Create a new job."""
-    return crud.create_job(db=db, job=job)
+def create_job(
+    job: schemas.JobCreate,
+    on_duplicate: Optional[DuplicatePolicy] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Create a new job.
+    Near-duplicates are inserted, flagged via `duplicate_of`, or merged into the existing job.
+    """
+    return crud.create_job(db=db, job=job, on_duplicate=on_duplicate)
+
+
+@router.post("/bulk", response_model=List[schemas.JobResponse], status_code=status.HTTP_201_CREATED)
+def create_jobs(
+    jobs: List[schemas.JobCreate],
+    on_duplicate: Optional[DuplicatePolicy] = None,
+    db: Session = Depends(get_db)
+):
+    """Create several jobs in one transaction."""
+    return crud.create_jobs(db=db, jobs=jobs, on_duplicate=on_duplicate)
+
+
+@router.put("/upsert", response_model=schemas.UpsertResult)
+def upsert_jobs(jobs: List[schemas.JobUpsert], db: Session = Depends(get_db)):
+    """
+    Insert or update jobs by `external_id` in one transaction.
+    Items whose content is unchanged are skipped without writing or logging a change.
+    """
+    try:
+        return crud.upsert_jobs(db=db, jobs=jobs)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A concurrent upsert inserted the same external_id; retry the request"
+        )
 
 
 @router.get("", response_model=List[schemas.JobResponse])
@@ -21,6 +58,31 @@ def get_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     return jobs
 
 
+@router.get("/search", response_model=List[schemas.JobSearchHit])
+def search_jobs(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Words to find in job titles and descriptions"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over job titles and descriptions, best match first.
+    `X-Total-Count` gives the total number of hits.
+    """
+    total, hits = search.search_jobs(db, q, skip=skip, limit=limit)
+    response.headers["X-Total-Count"] = str(total)
+    jobs_by_id = {j.id: j for j in crud.get_jobs_by_ids(db=db, job_ids=[job_id for job_id, _ in hits])}
+    return [
+        schemas.JobSearchHit(
+            **schemas.JobResponse.model_validate(jobs_by_id[job_id]).model_dump(),
+            score=score
+        )
+        for job_id, score in hits
+        if job_id in jobs_by_id
+    ]
+
+
 @router.get("/{job_id}", response_model=schemas.JobResponse)
 def get_job(job_id: int, db: Session = Depends(get_db)):
     """Get a specific job by ID."""
@@ -33,6 +95,39 @@ def get_job(job_id: int, db: Session = Depends(get_db)):
     return job
 
 
+@router.get("/{job_id}/similar", response_model=List[schemas.SimilarJob])
+def get_similar_jobs(
+    job_id: int,
+    threshold: float = Query(0.5, ge=0.4, le=1, description="Minimum Jaccard similarity (LSH recall drops below ~0.4)"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Get jobs with similar skills (and title), most similar first."""
+    job = crud.get_job(db=db, job_id=job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id {job_id} not found"
+        )
+    
+    similar = similarity.find_similar_jobs(job, threshold, limit=limit)
+    if similar is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The similarity index is still being built, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    jobs_by_id = {j.id: j for j in crud.get_jobs_by_ids(db=db, job_ids=[similar_id for similar_id, _ in similar])}
+    return [
+        schemas.SimilarJob(
+            **schemas.JobResponse.model_validate(jobs_by_id[similar_id]).model_dump(),
+            similarity=score
+        )
+        for similar_id, score in similar
+        if similar_id in jobs_by_id
+    ]
+
+
 @router.put("/{job_id}", response_model=schemas.JobResponse)
 def update_job(
     job_id: int,
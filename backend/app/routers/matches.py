@@ -1,19 +1,79 @@
 """Matching endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import os
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app import crud, matching, schemas
-from app.database import get_db
+from typing import List, Literal, Optional
+from app import crud, matching, schemas, sharding
+from app.changefeed import compute_match_deltas, wait_for_changes
+from app.concurrency import AdmissionController, Overloaded, SingleFlight
+from app.database import SessionLocal, get_db
 
 router = APIRouter(prefix="/candidates", tags=["matches"])
 
+# Identical concurrent match requests share one computation; the requests
+# waiting on it take places in the admission queue below, so they are bounded too
+_match_flights = SingleFlight()
+
+# At most this many match computations run at once; a bounded number wait
+# briefly for a slot and the rest are shed with 503 + Retry-After
+_match_admission = AdmissionController(
+    max_concurrent=int(os.getenv("MATCH_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("MATCH_MAX_QUEUE", "16")),
+    queue_timeout=float(os.getenv("MATCH_QUEUE_TIMEOUT", "2")),
+    retry_after=int(os.getenv("MATCH_RETRY_AFTER", "1"))
+)
+
+# Time budget of mode=approximate requests that do not pass deadline_ms
+DEFAULT_DEADLINE_MS = int(os.getenv("MATCH_DEADLINE_MS", "50"))
+
+# Seconds between keep-alive comments on idle match streams
+STREAM_HEARTBEAT_SECONDS = 15
+
 
 @router.get("/{candidate_id}/matches", response_model=List[schemas.JobMatch], response_model_by_alias=False)
-def get_candidate_matches(candidate_id: int, db: Session = Depends(get_db)):
+def get_candidate_matches(
+    candidate_id: int,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (all matches when omitted)"),
+    q: Optional[str] = Query(None, min_length=1, description="Only score jobs whose title or description matches"),
+    must_have: Optional[List[str]] = Query(None, description="Only score jobs requiring all of these skills"),
+    max_required_years: Optional[int] = Query(None, ge=0, description="Only score jobs requiring at most this many years"),
+    title: Optional[str] = Query(None, min_length=1, description="Only score jobs whose title contains these words"),
+    mode: Literal["exact", "approximate"] = Query("exact", description="approximate: best matches found within the deadline"),
+    deadline_ms: Optional[int] = Query(None, ge=1, le=60000, description="Time budget; implies mode=approximate"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """
     Get all jobs with match scores for a specific candidate.
     Results are sorted by match score descending.
+    
+    Supports pagination via `skip`/`limit` (`X-Total-Count` gives the total) and
+    conditional requests: the `ETag` changes whenever any job or candidate does.
+    
+    Filters (`q`, `must_have`, `max_required_years`, `title`) are applied in
+    the database before anything is scored; `X-Catalogue-Size` and
+    `X-Candidate-Set-Size` report the job counts before and after filtering.
+    
+    With `mode=approximate` or `deadline_ms`, unfiltered requests score jobs
+    sharing the most skills with the candidate first and return the best
+    matches found when the time budget runs out. `X-Match-Exact` says whether
+    the result equals the exhaustive one and `X-Jobs-Examined` how many jobs
+    were scored.
+    
+    Identical concurrent requests are coalesced into one computation, and
+    under overload requests are rejected with 503 and `Retry-After`.
     """
+    started = time.monotonic()
+    if deadline_ms is not None:
+        mode = "approximate"
+    deadline = started + (deadline_ms or DEFAULT_DEADLINE_MS) / 1000
+    
     # Get candidate
     candidate = crud.get_candidate(db=db, candidate_id=candidate_id)
     if candidate is None:
@@ -22,14 +82,214 @@ def get_candidate_matches(candidate_id: int, db: Session = Depends(get_db)):
             detail=f"Candidate with id {candidate_id} not found"
         )
     
-    # Get all jobs
-    jobs = crud.get_all_jobs(db=db)
+    # Read the change position first so a stream started from it misses nothing
+    change_seq = crud.get_latest_change_seq(db=db)
+    headers = {
+        "X-Change-Seq": str(change_seq),
+        "ETag": f'W/"{candidate_id}-{change_seq}"',
+        "Cache-Control": "private, no-cache",
+    }
+    if if_none_match and headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     
-    # Calculate matches (returns list of dicts)
-    matches_dicts = matching.get_job_matches(candidate, jobs)
+    def compute():
+        with _match_admission.admit():
+            top_k = skip + limit if limit is not None else None
+            
+            # Get the jobs to score, filtered in the database
+            filtered = any(f is not None for f in (q, must_have, max_required_years, title))
+            if not filtered and mode == "approximate":
+                # Filtered requests already score a bounded set, so they stay exact
+                page, examined, exact = matching.get_job_matches_until(
+                    candidate,
+                    crud.iter_jobs_by_skill_overlap(db=db, skills=candidate.get_skills_list()),
+                    deadline,
+                    top_k=top_k
+                )
+                catalogue_size = crud.count_jobs(db=db)
+                return catalogue_size, catalogue_size, page[skip:], examined, exact
+            
+            if not filtered:
+                # Whole-catalogue scans fan out to the shard workers when enabled
+                try:
+                    matcher = sharding.get_matcher()
+                    if matcher is not None:
+                        catalogue_size, page = matcher.match(candidate, change_seq, top_k=top_k)
+                        return catalogue_size, catalogue_size, page[skip:], catalogue_size, True
+                except sharding.ShardError:
+                    sharding.shutdown_matcher()  # Restarted in the background; score in-process meanwhile
+            
+            if filtered:
+                jobs = crud.get_jobs_for_matching(
+                    db=db,
+                    must_have=must_have,
+                    max_required_years=max_required_years,
+                    title=title,
+                    q=q
+                )
+                catalogue_size = crud.count_jobs(db=db)
+            else:
+                jobs = crud.get_all_jobs(db=db, limit=None)
+                catalogue_size = len(jobs)
+            
+            # Calculate matches (returns list of dicts)
+            page = matching.get_job_matches(candidate, jobs, top_k=top_k)[skip:]
+            return catalogue_size, len(jobs), page, len(jobs), True
+    
+    # The change position keeps requests made after a write from sharing an older result
+    flight_key = (
+        candidate_id, change_seq, skip, limit, q,
+        tuple(must_have) if must_have else None, max_required_years, title,
+        mode, deadline_ms if mode == "approximate" else None
+    )
+    try:
+        catalogue_size, candidate_set_size, matches_dicts, examined, exact = _match_flights.do(
+            flight_key, compute, follow=_match_admission.queued
+        )
+    except Overloaded as overloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many match requests in progress, please retry shortly",
+            headers={"Retry-After": str(overloaded.retry_after)}
+        )
+    response.headers["X-Catalogue-Size"] = str(catalogue_size)
+    response.headers["X-Candidate-Set-Size"] = str(candidate_set_size)
+    response.headers["X-Total-Count"] = str(candidate_set_size)
+    response.headers["X-Jobs-Examined"] = str(examined)
+    response.headers["X-Match-Exact"] = "true" if exact else "false"
+    if not exact:
+        # A partial result must not be revalidated as the exhaustive one
+        del response.headers["ETag"]
     
     # Convert dicts to Pydantic models for proper serialization
     matches = [schemas.JobMatch(**match_dict) for match_dict in matches_dicts]
     
     return matches
 
+
+@router.get("/{candidate_id}/matches/summary", response_model=schemas.MatchSummary)
+def get_candidate_match_summary(
+    candidate_id: int,
+    response: Response,
+    bucket_size: int = Query(10, ge=1, le=100, description="Histogram bucket width in score points"),
+    thresholds: Optional[List[int]] = Query(None, description="Count jobs scoring at or above these (default 50, 70, 90)"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a histogram of a candidate's match scores and counts above thresholds.
+    
+    Jobs are counted by skill overlap, skill count and required years in one
+    SQL aggregation over the skill postings, and each distinct group is
+    scored once, so no individual match is built. Supports `ETag` like the
+    matches endpoint.
+    """
+    candidate = crud.get_candidate(db=db, candidate_id=candidate_id)
+    if candidate is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidate with id {candidate_id} not found"
+        )
+    thresholds = thresholds if thresholds is not None else [50, 70, 90]
+    if any(not 0 <= threshold <= 100 for threshold in thresholds):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Thresholds must be between 0 and 100"
+        )
+    
+    change_seq = crud.get_latest_change_seq(db=db)
+    headers = {
+        "X-Change-Seq": str(change_seq),
+        "ETag": f'W/"{candidate_id}-{change_seq}"',
+        "Cache-Control": "private, no-cache",
+    }
+    if if_none_match and headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    
+    try:
+        with _match_admission.admit():
+            groups = crud.count_jobs_by_score_inputs(db=db, skills=candidate.get_skills_list())
+    except Overloaded as overloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many match requests in progress, please retry shortly",
+            headers={"Retry-After": str(overloaded.retry_after)}
+        )
+    histogram, at_or_above = matching.summarize_scores(
+        groups, candidate.years_experience, bucket_size=bucket_size, thresholds=thresholds
+    )
+    return schemas.MatchSummary(
+        total=sum(histogram),
+        histogram=[
+            schemas.ScoreBucket(
+                min_score=index * bucket_size,
+                max_score=100 if index == len(histogram) - 1 else (index + 1) * bucket_size - 1,
+                count=count
+            )
+            for index, count in enumerate(histogram)
+        ],
+        thresholds=[
+            schemas.ThresholdCount(threshold=threshold, count=count)
+            for threshold, count in at_or_above.items()
+        ]
+    )
+
+
+def _load_stream_start(candidate_id: int):
+    """Load the candidate (detached) and the current change sequence with a short-lived session."""
+    db = SessionLocal()
+    try:
+        return crud.get_candidate(db, candidate_id), crud.get_latest_change_seq(db)
+    finally:
+        db.close()
+
+
+@router.get("/{candidate_id}/matches/stream")
+async def stream_candidate_matches(
+    candidate_id: int,
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="Change sequence to resume from (defaults to now)"),
+    last_event_id: Optional[int] = Header(None)
+):
+    """
+    Stream match deltas for a candidate as Server-Sent Events.
+    
+    Events are `added`/`updated` (data is a job match), `removed` (data has
+    `jobId`), `reset` (the candidate changed; refetch all matches) and `closed`
+    (the candidate was deleted). Each event id is the change sequence number,
+    so reconnecting clients resume via `Last-Event-ID`.
+    """
+    candidate, latest_seq = await run_in_threadpool(_load_stream_start, candidate_id)
+    if candidate is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidate with id {candidate_id} not found"
+        )
+    
+    if last_event_id is not None:
+        position = last_event_id
+    elif since is not None:
+        position = since
+    else:
+        position = latest_seq
+    
+    async def event_stream():
+        # No session is held across awaits: an idle stream must not pin a pooled connection
+        nonlocal candidate, position
+        while candidate is not None and not await request.is_disconnected():
+            changes = await wait_for_changes(position, limit=100, timeout=STREAM_HEARTBEAT_SECONDS)
+            if not changes:
+                yield ": keep-alive\n\n"
+                continue
+            candidate, deltas = await run_in_threadpool(compute_match_deltas, candidate, changes)
+            position = changes[-1].seq
+            for seq, event, data in deltas:
+                yield f"id: {seq}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,24 @@
+"""Catalogue statistics endpoints."""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal
+from app import crud, schemas
+from app.database import get_db
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/skills", response_model=List[schemas.SkillStat])
+def get_skill_stats(
+    sort: Literal["demand", "supply", "gap"] = Query(
+        "demand", description="demand: most required by jobs; supply: most common among candidates; "
+                              "gap: most demanded relative to supply"
+    ),
+    limit: int = Query(20, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the top skills by demand, supply or gap.
+    Served from counters kept up to date on every write, so cost does not grow with the catalogue.
+    """
+    return crud.get_skill_stats(db=db, sort=sort, limit=limit)
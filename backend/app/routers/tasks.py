@@ -0,0 +1,61 @@
+"""Background task endpoints."""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app import models, schemas, tasks
+from app.database import get_db
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+def _to_response(task: models.Task) -> schemas.TaskResponse:
+    return schemas.TaskResponse(
+        id=task.id,
+        kind=task.kind,
+        status=task.status,
+        attempts=task.attempts,
+        max_attempts=task.max_attempts,
+        progress=task.progress,
+        total=task.total,
+        result=task.get_result(),
+        error=task.error,
+        run_after=task.run_after,
+        created_at=task.created_at,
+        updated_at=task.updated_at
+    )
+
+
+@router.post("", response_model=schemas.TaskResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
+    """Queue a background task; poll GET /tasks/{task_id} for progress and result."""
+    try:
+        db_task = tasks.enqueue(db, task.kind, task.params, max_attempts=task.max_attempts)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown task kind {task.kind!r}; expected one of {', '.join(tasks.task_kinds())}"
+        )
+    return _to_response(db_task)
+
+
+@router.get("/{task_id}", response_model=schemas.TaskResponse)
+def get_task(task_id: int, db: Session = Depends(get_db)):
+    """Get a task's status, progress and result."""
+    db_task = tasks.get_task(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return _to_response(db_task)
+
+
+@router.get("/{task_id}/matches", response_model=List[schemas.TaskMatch])
+def get_task_matches(
+    task_id: int,
+    candidate_id: Optional[int] = Query(None, description="Only this candidate's matches"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Get the matches stored by a recompute_matches task, by candidate and then best first."""
+    if tasks.get_task(db, task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return tasks.get_task_matches(db, task_id, candidate_id=candidate_id, skip=skip, limit=limit)
@@ -1,6 +1,15 @@
 """Pydantic schemas for request/response validation."""
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import Any, List, Optional
+from datetime import datetime
+import json
+
+
+def _parse_skills(value):
+    """Accept skills stored as a JSON string on the ORM models."""
+    if isinstance(value, str):
+        return json.loads(value) if value else []
+    return value
 
 
 # Job Schemas
@@ -25,11 +34,30 @@ class JobUpdate(BaseModel):
     min_years_experience: Optional[int] = Field(None, ge=0)
 
 
+class JobUpsert(JobCreate):
+    """Schema for an item of a job upsert, keyed by the upstream feed's ID."""
+    external_id: str = Field(..., min_length=1, description="ID of the job in the upstream feed")
+
+
 class JobResponse(JobBase):
     """Schema for job response."""
     model_config = ConfigDict(from_attributes=True)
     
     id: int
+    external_id: Optional[str] = None
+    duplicate_of: Optional[int] = Field(None, description="ID of the posting this one near-duplicates")
+
+    _parse_required_skills = field_validator("required_skills", mode="before")(_parse_skills)
+
+
+class SimilarJob(JobResponse):
+    """Schema for a similar-job lookup result."""
+    similarity: float = Field(..., ge=0, le=1, description="Jaccard similarity of skills (and title words)")
+
+
+class JobSearchHit(JobResponse):
+    """Schema for a full-text search result."""
+    score: float = Field(..., description="BM25 relevance, higher is better")
 
 
 # Candidate Schemas
@@ -42,7 +70,9 @@ class CandidateBase(BaseModel):
 
 class CandidateCreate(CandidateBase):
     """Schema for creating a candidate."""
-    pass
+    alert_threshold: Optional[int] = Field(
+        None, ge=0, le=100, description="Notify when a new job scores at least this; omit to disable alerts"
+    )
 
 
 class CandidateUpdate(BaseModel):
@@ -50,6 +80,16 @@ class CandidateUpdate(BaseModel):
     name: Optional[str] = None
     skills: Optional[List[str]] = None
     years_experience: Optional[int] = Field(None, ge=0)
+    alert_threshold: Optional[int] = Field(None, ge=0, le=100, description="Pass null to disable alerts")
+
+
+class CandidateUpsert(CandidateBase):
+    """
+    Schema for an item of a candidate upsert, keyed by the upstream feed's ID.
+    
+    Alert thresholds belong to the candidate, not the feed, so upserts leave them alone.
+    """
+    external_id: str = Field(..., min_length=1, description="ID of the candidate in the upstream feed")
 
 
 class CandidateResponse(CandidateBase):
@@ -57,6 +97,28 @@ class CandidateResponse(CandidateBase):
     model_config = ConfigDict(from_attributes=True)
     
     id: int
+    external_id: Optional[str] = None
+    alert_threshold: Optional[int] = None
+
+    _parse_candidate_skills = field_validator("skills", mode="before")(_parse_skills)
+
+
+class UpsertResult(BaseModel):
+    """Schema for the outcome of a bulk upsert."""
+    inserted: int
+    updated: int
+    unchanged: int = Field(..., description="Items skipped because their content hash matched")
+    ids: List[int] = Field(..., description="Row ID for each input item, in input order")
+
+
+class Notification(BaseModel):
+    """Schema for a new job that met a candidate's alert threshold."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    job_id: int
+    match_score: int = Field(..., ge=0, le=100)
+    created_at: datetime
 
 
 # Match Schema
@@ -82,3 +144,85 @@ class JobMatch(BaseModel):
     minYearsExperience: int
     matchScore: int = Field(..., ge=0, le=100, description="Match score from 0 to 100")
 
+
+
+class ScoreBucket(BaseModel):
+    """Schema for one bar of a match score histogram."""
+    min_score: int
+    max_score: int = Field(..., description="Inclusive upper bound")
+    count: int
+
+
+class ThresholdCount(BaseModel):
+    """Schema for the number of jobs matching at or above a score."""
+    threshold: int
+    count: int
+
+
+class MatchSummary(BaseModel):
+    """Schema for a candidate's match score distribution."""
+    total: int = Field(..., description="Number of jobs scored")
+    histogram: List[ScoreBucket]
+    thresholds: List[ThresholdCount]
+
+
+# Change Feed Schemas
+class ChangeEvent(BaseModel):
+    """Schema for a single change log entry."""
+    seq: int
+    entity: str
+    entity_id: Optional[int] = None
+    op: str
+    data: Optional[Any] = None
+    created_at: datetime
+
+
+class ChangeFeed(BaseModel):
+    """Schema for a page of the change feed."""
+    changes: List[ChangeEvent]
+    next_since: int = Field(..., description="Pass as `since` to continue after this page")
+
+
+# Statistics Schemas
+class SkillStat(BaseModel):
+    """Schema for a skill's demand and supply counters."""
+    model_config = ConfigDict(from_attributes=True)
+
+    skill: str
+    job_count: int = Field(..., description="Jobs requiring the skill")
+    candidate_count: int = Field(..., description="Candidates listing the skill")
+    gap: int = Field(..., description="job_count - candidate_count")
+
+
+# Task Schemas
+class TaskCreate(BaseModel):
+    """Schema for queueing a background task."""
+    kind: str = Field(..., description="Task kind, e.g. import or rebuild_search_index")
+    params: dict = Field(default_factory=dict)
+    max_attempts: int = Field(3, ge=1, le=10)
+
+
+class TaskResponse(BaseModel):
+    """Schema for task status."""
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    progress: int
+    total: Optional[int] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    run_after: datetime
+    created_at: datetime
+    updated_at: datetime
+
+
+class TaskMatch(BaseModel):
+    """Schema for one of a candidate's top matches from a recompute_matches task."""
+    model_config = ConfigDict(from_attributes=True)
+
+    candidate_id: int
+    rank: int = Field(..., description="0 is the candidate's best match")
+    job_id: int
+    match_score: int = Field(..., ge=0, le=100)
@@ -0,0 +1,178 @@
+"""SQLite FTS5 full-text search over job titles and descriptions."""
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import Select, bindparam, literal_column, select, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+# Title matches count double towards the BM25 rank
+TITLE_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# External-content FTS table: the index stores tokens only and reads text through
+# a view that decompresses long descriptions (zdecompress is registered per connection)
+_FTS_CONTENT = "jobs_fts_content"
+
+_FTS_DDL = [
+    f"""
+    CREATE VIEW IF NOT EXISTS {_FTS_CONTENT} AS
+    SELECT id, title, COALESCE(zdecompress(description_z), description) AS description FROM jobs
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, description, content='{_FTS_CONTENT}', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, description)
+        VALUES (new.id, new.title, COALESCE(zdecompress(new.description_z), new.description));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, COALESCE(zdecompress(old.description_z), old.description));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, description, description_z ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, COALESCE(zdecompress(old.description_z), old.description));
+        INSERT INTO jobs_fts(rowid, title, description)
+        VALUES (new.id, new.title, COALESCE(zdecompress(new.description_z), new.description));
+    END
+    """,
+]
+
+# Dropped before recreating an index built by an older version
+_FTS_OBJECTS = [
+    ("TRIGGER", "jobs_fts_insert"),
+    ("TRIGGER", "jobs_fts_delete"),
+    ("TRIGGER", "jobs_fts_update"),
+    ("TABLE", "jobs_fts"),
+    ("VIEW", _FTS_CONTENT),
+]
+
+
+def create_search_index(target, connection: Connection, **kw) -> None:
+    """Create the FTS table and its sync triggers (after_create hook for `jobs`)."""
+    for statement in _FTS_DDL:
+        connection.execute(text(statement))
+
+
+def drop_search_index(target, connection: Connection, **kw) -> None:
+    """Drop the FTS table, its triggers and content view (before_drop hook for `jobs`)."""
+    for kind, name in _FTS_OBJECTS:
+        connection.execute(text(f"DROP {kind} IF EXISTS {name}"))
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Re-index every job from the `jobs` table."""
+    connection.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create and populate the FTS index for a database that predates it or its current layout."""
+    with engine.begin() as conn:
+        definition = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")
+        ).scalar()
+        if definition is None or _FTS_CONTENT not in definition:
+            drop_search_index(None, conn)
+            create_search_index(None, conn)
+            rebuild_search_index(conn)
+
+
+def to_match_query(q: str, column: Optional[str] = None) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word must match; the last one also matches as a prefix so partially
+    typed queries work. Words are quoted, so FTS operators in user input are
+    treated as plain text.
+
+    Args:
+        q: Free-text query
+        column: Restrict matching to this column ("title" or "description")
+
+    Returns:
+        The MATCH expression, or None if `q` has no searchable words
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    expression = " ".join(terms)
+    return f"{column} : ({expression})" if column else expression
+
+
+def match_ids_subquery(q: str, column: Optional[str] = None) -> Optional[Select]:
+    """
+    Build a SELECT of the IDs of jobs matching `q`, for use in `Job.id.in_(...)`.
+
+    Returns:
+        The subquery, or None if `q` has no searchable words
+    """
+    match = to_match_query(q, column)
+    if match is None:
+        return None
+    return (
+        select(literal_column("rowid"))
+        .select_from(table("jobs_fts"))
+        # Unique bind name, so several of these can be combined in one query
+        .where(text("jobs_fts MATCH :match").bindparams(bindparam("match", match, unique=True)))
+    )
+
+
+def search_jobs(
+    db: Session,
+    q: str,
+    skip: int = 0,
+    limit: Optional[int] = 20
+) -> Tuple[int, List[Tuple[int, float]]]:
+    """
+    Search job titles and descriptions, best BM25 match first.
+
+    Args:
+        db: Database session
+        q: Free-text query
+        skip: Number of hits to skip
+        limit: Maximum number of hits (None for all)
+
+    Returns:
+        Total number of hits and a page of (job_id, score) tuples, where a
+        higher score is a better match
+    """
+    match = to_match_query(q)
+    if match is None:
+        return 0, []
+    total = db.execute(
+        text("SELECT COUNT(*) FROM jobs_fts WHERE jobs_fts MATCH :match"),
+        {"match": match}
+    ).scalar()
+    rows = db.execute(
+        text(
+            "SELECT rowid, bm25(jobs_fts, :title_weight, :description_weight) AS rank "
+            "FROM jobs_fts WHERE jobs_fts MATCH :match ORDER BY rank LIMIT :limit OFFSET :skip"
+        ),
+        {
+            "match": match,
+            "title_weight": TITLE_WEIGHT,
+            "description_weight": DESCRIPTION_WEIGHT,
+            "limit": -1 if limit is None else limit,
+            "skip": skip,
+        }
+    ).all()
+    # bm25() is lower-is-better; negate so scores read naturally
+    return total, [(job_id, -rank) for job_id, rank in rows]
+
+
+def search_job_ids(db: Session, q: str, column: Optional[str] = None) -> List[int]:
+    """Get the IDs of every job matching `q`, in ID order."""
+    subquery = match_ids_subquery(q, column)
+    if subquery is None:
+        return []
+    rows = db.execute(subquery.order_by(literal_column("rowid")))
+    return [job_id for (job_id,) in rows]
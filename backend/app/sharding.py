@@ -0,0 +1,311 @@
+"""Sharded scatter-gather matching across long-lived worker processes."""
+import heapq
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Tuple
+from app import crud, matching, models
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Number of shard worker processes; 0 keeps matching in the request thread
+NUM_SHARDS = int(os.getenv("MATCH_SHARDS", "0"))
+
+# Scatter-gathers that can be in flight at once, each over its own pipe to every worker
+NUM_CHANNELS = int(os.getenv("MATCH_SHARD_CHANNELS", os.getenv("MATCH_MAX_CONCURRENCY", "4")))
+
+# A parsed job as held by a shard: (title, skills list, distinct skills, min years)
+ParsedJob = Tuple[str, List[str], frozenset, int]
+
+# A shard's scored job: (score, job id, title, skills list, min years)
+ScoredJob = Tuple[int, int, str, List[str], int]
+
+
+def _merge_key(scored: ScoredJob):
+    # Score descending, then job ID: the order a stable sort of the
+    # ID-ordered catalogue produces, so results match the sequential path
+    return -scored[0], scored[1]
+
+
+def _parse_job(title: str, skills: List[str], min_years_experience: int) -> ParsedJob:
+    return title, skills, frozenset(skills), min_years_experience
+
+
+class _Shard:
+    """State owned by one worker process: its slice of the catalogue."""
+
+    def __init__(self, index: int, count: int):
+        self.index = index
+        self.count = count
+        self.jobs: Dict[int, ParsedJob] = {}
+        self.seq = 0
+
+    def owns(self, job_id: int) -> bool:
+        return job_id % self.count == self.index
+
+    def load(self) -> None:
+        """Load this shard's jobs. Changes after the recorded sequence are replayed later."""
+        db = SessionLocal()
+        try:
+            self.seq = crud.get_latest_change_seq(db)
+            rows = db.query(
+                models.Job.id, models.Job.title, models.Job.required_skills, models.Job.min_years_experience
+            ).filter(models.Job.id % self.count == self.index)
+            for job_id, title, required_skills, min_years in rows.yield_per(1000):
+                skills = models.Job(required_skills=required_skills).get_skills_list()
+                self.jobs[job_id] = _parse_job(title, skills, min_years)
+        finally:
+            db.close()
+
+    def catch_up(self, target_seq: int) -> None:
+        """Apply logged job changes up to `target_seq` (replays are idempotent)."""
+        if target_seq <= self.seq:
+            return
+        db = SessionLocal()
+        try:
+            while self.seq < target_seq:
+                changes = crud.get_changes(db, since=self.seq, limit=1000)
+                if not changes:
+                    break
+                for change in changes:
+                    if change.entity == "job":
+                        self._apply(db, change)
+                    self.seq = change.seq
+        finally:
+            db.close()
+
+    def _apply(self, db, change: models.ChangeEvent) -> None:
+        if change.op == "bulk_create":
+            ids = [job_id for job_id in change.get_payload()["ids"] if self.owns(job_id)]
+            for job in crud.get_jobs_by_ids(db, ids):
+                self.jobs[job.id] = _parse_job(job.title, job.get_skills_list(), job.min_years_experience)
+        elif not self.owns(change.entity_id):
+            return
+        elif change.op == "delete":
+            self.jobs.pop(change.entity_id, None)
+        else:
+            snapshot = change.get_payload()
+            self.jobs[change.entity_id] = _parse_job(
+                snapshot["title"], snapshot["required_skills"], snapshot["min_years_experience"]
+            )
+
+    def match(self, skills: List[str], years_experience: int, top_k: Optional[int]) -> List[ScoredJob]:
+        """Score every job in the shard and return them best first (top_k only if given)."""
+        candidate_skills = set(skills)
+        scored = [
+            (
+                matching.score_from_counts(
+                    len(candidate_skills & job_skills), len(job_skills), years_experience, min_years
+                ),
+                job_id, title, skills_list, min_years
+            )
+            for job_id, (title, skills_list, job_skills, min_years) in self.jobs.items()
+        ]
+        if top_k is not None:
+            return heapq.nsmallest(top_k, scored, key=_merge_key)
+        scored.sort(key=_merge_key)
+        return scored
+
+
+def _worker_main(index: int, count: int, conns: list) -> None:
+    """Worker process loop: load the shard, then answer match requests from any channel."""
+    shard = _Shard(index, count)
+    shard.load()
+    conns[0].send(("ready", len(shard.jobs)))
+    open_conns = list(conns)
+    while open_conns:
+        for conn in wait(open_conns):
+            try:
+                message = conn.recv()
+            except EOFError:
+                open_conns.remove(conn)
+                continue
+            if message[0] == "stop":
+                return
+            _, skills, years_experience, target_seq, top_k = message
+            try:
+                shard.catch_up(target_seq)
+                conn.send(("ok", len(shard.jobs), shard.match(skills, years_experience, top_k)))
+            except Exception as error:  # Report instead of dying; the coordinator decides
+                conn.send(("error", repr(error)))
+
+
+class ShardError(RuntimeError):
+    """Raised when a shard worker fails or disappears."""
+
+
+class ShardedMatcher:
+    """
+    Coordinator for N shard workers, each owning the jobs with id % N == i.
+
+    A match request is sent to every shard together with the caller's change
+    sequence; each shard first replays logged changes up to it, then scores
+    its slice and returns its top-K, and the per-shard lists are merged.
+
+    Each worker has one pipe per channel, and a request holds a channel for
+    its whole scatter-gather, so up to `num_channels` requests are in flight
+    at once and replies never mix.
+    """
+
+    def __init__(self, num_shards: int, num_channels: int = NUM_CHANNELS):
+        self.num_shards = num_shards
+        self.num_channels = max(1, num_channels)
+        self._processes = []
+        self._channels: List[list] = []  # Channel -> one connection per shard
+        self._free: "queue.Queue[int]" = queue.Queue()
+
+    def start(self) -> None:
+        """Spawn the workers and wait until each has loaded its shard."""
+        context = multiprocessing.get_context("spawn")
+        self._channels = [[] for _ in range(self.num_channels)]
+        for index in range(self.num_shards):
+            pipes = [context.Pipe() for _ in range(self.num_channels)]
+            process = context.Process(
+                target=_worker_main,
+                args=(index, self.num_shards, [child_conn for _, child_conn in pipes]),
+                daemon=True
+            )
+            process.start()
+            for channel, (parent_conn, child_conn) in enumerate(pipes):
+                child_conn.close()
+                self._channels[channel].append(parent_conn)
+            self._processes.append(process)
+        self._gather(self._channels[0])
+        for channel in range(self.num_channels):
+            self._free.put(channel)
+
+    def _gather(self, conns) -> list:
+        """Read one reply per shard, all of them before reporting a failure, so the channel stays in step."""
+        replies = []
+        for conn in conns:
+            try:
+                replies.append(conn.recv())
+            except (EOFError, OSError) as error:
+                raise ShardError("Shard worker exited") from error
+        errors = [reply[1] for reply in replies if reply[0] == "error"]
+        if errors:
+            raise ShardError(f"Shard worker failed: {errors[0]}")
+        return replies
+
+    def match(
+        self,
+        candidate: models.Candidate,
+        change_seq: int,
+        top_k: Optional[int] = None
+    ) -> Tuple[int, List[dict]]:
+        """
+        Score the whole catalogue for a candidate across all shards.
+
+        Args:
+            candidate: Candidate object
+            change_seq: Change sequence the result must reflect
+            top_k: If given, only the best `top_k` matches are returned
+
+        Returns:
+            Catalogue size and match dictionaries in get_job_matches order
+        """
+        request = ("match", candidate.get_skills_list(), candidate.years_experience, change_seq, top_k)
+        channel = self._free.get()
+        try:
+            conns = self._channels[channel]
+            try:
+                for conn in conns:
+                    conn.send(request)
+            except OSError as error:
+                raise ShardError("Shard worker exited") from error
+            replies = self._gather(conns)
+        finally:
+            self._free.put(channel)
+
+        catalogue_size = sum(reply[1] for reply in replies)
+        merged = heapq.merge(*(reply[2] for reply in replies), key=_merge_key)
+        if top_k is not None:
+            merged = (scored for _, scored in zip(range(top_k), merged))
+        return catalogue_size, [
+            {
+                "jobId": job_id,
+                "title": title,
+                "requiredSkills": skills,
+                "minYearsExperience": min_years,
+                "matchScore": score
+            }
+            for score, job_id, title, skills, min_years in merged
+        ]
+
+    def close(self) -> None:
+        """Stop the workers."""
+        for channel, conns in enumerate(self._channels):
+            for conn in conns:
+                try:
+                    if channel == 0:
+                        conn.send(("stop",))
+                    conn.close()
+                except OSError:
+                    pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._channels = []
+
+
+_matcher: Optional[ShardedMatcher] = None
+_matcher_lock = threading.Lock()
+_restart: Optional[threading.Thread] = None
+
+
+def _start_matcher() -> None:
+    global _matcher
+    matcher = ShardedMatcher(NUM_SHARDS)
+    try:
+        matcher.start()
+    except Exception:
+        matcher.close()
+        raise
+    with _matcher_lock:
+        _matcher = matcher
+
+
+def _restart_matcher() -> None:
+    try:
+        _start_matcher()
+    except Exception:
+        logger.exception("Restarting the shard workers failed")
+
+
+def start_matcher() -> None:
+    """Start the shard workers and load the catalogue, at application startup (no-op if MATCH_SHARDS is 0)."""
+    if NUM_SHARDS > 0:
+        _start_matcher()
+
+
+def get_matcher() -> Optional[ShardedMatcher]:
+    """
+    Get the process-wide sharded matcher, or None if it is disabled or not running.
+
+    A matcher stopped after a failure is restarted in the background, so no
+    request waits for workers to spawn and load; callers score in-process
+    until it is back.
+    """
+    global _restart
+    if NUM_SHARDS <= 0:
+        return None
+    with _matcher_lock:
+        if _matcher is None and (_restart is None or not _restart.is_alive()):
+            _restart = threading.Thread(target=_restart_matcher, name="shard-restart", daemon=True)
+            _restart.start()
+        return _matcher
+
+
+def shutdown_matcher() -> None:
+    """Stop the shard workers, e.g. after a failure or at application shutdown."""
+    global _matcher
+    with _matcher_lock:
+        matcher, _matcher = _matcher, None
+    if matcher is not None:
+        matcher.close()
@@ -0,0 +1,311 @@
+"""MinHash/LSH index for similar-job lookup and near-duplicate detection."""
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app import invalidation, models
+from app.database import IN_CHUNK_SIZE, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Signature layout: 32 bands of 4 rows puts the LSH candidate threshold
+# near a Jaccard similarity of (1/32) ** (1/4) ~= 0.42
+NUM_PERM = 128
+BANDS = 32
+
+# Whether title words count towards similarity alongside skills
+INCLUDE_TITLE = os.getenv("SIMILARITY_INCLUDE_TITLE", "true").lower() in ("1", "true", "yes")
+
+# What create_job does with near-duplicates: "allow", "flag" or "merge"
+DUPLICATE_POLICY = os.getenv("JOB_DUPLICATE_POLICY", "flag")
+DUPLICATE_THRESHOLD = float(os.getenv("JOB_DUPLICATE_THRESHOLD", "0.9"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(0x5EED)  # Fixed seed: signatures must be stable across processes
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def job_tokens(title: Optional[str], skills: Iterable[str], include_title: bool = INCLUDE_TITLE) -> FrozenSet[str]:
+    """
+    Build the token set a job is compared on.
+
+    Args:
+        title: Job title (ignored unless include_title is set)
+        skills: Required skills
+        include_title: Whether to add lower-cased title words
+
+    Returns:
+        Frozen set of namespaced tokens
+    """
+    tokens = {f"s:{skill.strip().lower()}" for skill in skills if skill.strip()}
+    if include_title and title:
+        tokens.update(f"t:{word}" for word in re.findall(r"\w+", title.lower()))
+    return frozenset(tokens)
+
+
+def _token_hash(token: str) -> int:
+    """Stable 32-bit hash of a token (the built-in hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+def minhash_signature(tokens: Iterable[str]) -> Tuple[int, ...]:
+    """Compute the MinHash signature of a token set."""
+    hashes = [_token_hash(token) for token in tokens]
+    if not hashes:
+        return tuple([_MAX_HASH] * NUM_PERM)
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    )
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Exact Jaccard similarity of two token sets."""
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """
+    Banded LSH over MinHash signatures.
+
+    Lookups only touch keys that share at least one band bucket with the
+    query, then verify them with exact Jaccard similarity.
+    """
+
+    def __init__(self, bands: int = BANDS):
+        self._bands = bands
+        self._rows = NUM_PERM // bands
+        self._buckets: List[Dict[Tuple[int, ...], Set[int]]] = [{} for _ in range(bands)]
+        self._entries: Dict[int, Tuple[FrozenSet[str], Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self._bands):
+            yield band, signature[band * self._rows:(band + 1) * self._rows]
+
+    def add(self, key: int, tokens: FrozenSet[str]) -> None:
+        """Insert or replace the entry for `key`."""
+        self.remove(key)
+        signature = minhash_signature(tokens)
+        self._entries[key] = (tokens, signature)
+        if not tokens:
+            return  # Empty sets are never similar to anything
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+
+    def remove(self, key: int) -> None:
+        """Remove the entry for `key`, if present."""
+        entry = self._entries.pop(key, None)
+        if entry is None or not entry[0]:
+            return
+        for band, band_key in self._band_keys(entry[1]):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def tokens(self, key: int) -> Optional[FrozenSet[str]]:
+        """Get the token set stored for `key`."""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def query(
+        self,
+        tokens: FrozenSet[str],
+        threshold: float,
+        limit: Optional[int] = None,
+        exclude: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Find entries similar to a token set.
+
+        Args:
+            tokens: Query token set
+            threshold: Minimum exact Jaccard similarity
+            limit: Maximum number of results
+            exclude: Key to leave out (typically the query's own key)
+
+        Returns:
+            List of (key, similarity) tuples, most similar first
+        """
+        if not tokens:
+            return []
+        candidates: Set[int] = set()
+        for band, band_key in self._band_keys(minhash_signature(tokens)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        candidates.discard(exclude)
+
+        results = []
+        for key in candidates:
+            similarity = jaccard(tokens, self._entries[key][0])
+            if similarity >= threshold:
+                results.append((key, similarity))
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit] if limit is not None else results
+
+
+# Process-wide index over the job catalogue, built in the background at startup
+# and kept current from the change log, so writes by other workers are picked up too
+_job_index: Optional[MinHashLSH] = None
+_job_index_lock = threading.RLock()
+_job_index_build: Optional[threading.Thread] = None
+_generation = 0  # Bumped by every reset, so a build started before one is discarded
+_pending: Optional[List[Tuple[str, Optional[int], Optional[dict]]]] = None  # Changes logged during a build
+
+
+def _tokens_for(job: models.Job) -> FrozenSet[str]:
+    return job_tokens(job.title, job.get_skills_list())
+
+
+def _add_rows(index: MinHashLSH, rows) -> None:
+    for job_id, title, required_skills in rows:
+        index.add(job_id, _tokens_for(models.Job(title=title, required_skills=required_skills)))
+
+
+def _apply_change(index: MinHashLSH, db: Session, op: str, entity_id: Optional[int], payload: Optional[dict]) -> None:
+    if op == "bulk_create":
+        ids = payload["ids"]
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            _add_rows(index, db.query(
+                models.Job.id, models.Job.title, models.Job.required_skills
+            ).filter(models.Job.id.in_(ids[start:start + IN_CHUNK_SIZE])))
+    elif op == "delete":
+        index.remove(entity_id)
+    else:
+        index.add(entity_id, job_tokens(payload["title"], payload["required_skills"]))
+
+
+class _JobIndexListener(invalidation.ChangeListener):
+    """Applies job change events to the index, or queues them while it is being built."""
+
+    def apply(self, db: Session, changes: List[models.ChangeEvent]) -> None:
+        with _job_index_lock:
+            for change in changes:
+                if change.entity != "job":
+                    continue
+                if _job_index is not None:
+                    _apply_change(_job_index, db, change.op, change.entity_id, change.get_payload())
+                elif _pending is not None:
+                    _pending.append((change.op, change.entity_id, change.get_payload()))
+
+    def reset(self) -> None:
+        reset_job_index()
+
+
+invalidation.watcher.subscribe(_JobIndexListener())
+
+
+def build_job_index(db: Session) -> MinHashLSH:
+    """
+    Build the job index from the database and install it.
+
+    Reads run without the index lock, so writes and lookups are not held up;
+    changes logged meanwhile are queued by the listener and replayed before
+    the index is installed.
+    """
+    global _job_index, _pending
+    with _job_index_lock:
+        generation = _generation
+        if _pending is None:
+            _pending = []
+    try:
+        index = MinHashLSH()
+        _add_rows(index, db.query(
+            models.Job.id, models.Job.title, models.Job.required_skills
+        ).yield_per(1000))
+        with _job_index_lock:
+            if _job_index is not None:
+                return _job_index  # Another build finished first
+            if generation != _generation:
+                return index  # The change log was replaced meanwhile; leave it to the next build
+            for op, entity_id, payload in _pending:
+                _apply_change(index, db, op, entity_id, payload)
+            _job_index, _pending = index, None
+            return index
+    except Exception:
+        with _job_index_lock:
+            if _job_index is None and generation == _generation:
+                _pending = None
+        raise
+
+
+def _build_in_background() -> None:
+    db = SessionLocal()
+    try:
+        build_job_index(db)
+    except Exception:
+        logger.exception("Building the job similarity index failed")
+    finally:
+        db.close()
+
+
+def start_job_index() -> None:
+    """Build the job index in a background thread, unless it is built or being built."""
+    global _job_index_build
+    with _job_index_lock:
+        if _job_index is None and (_job_index_build is None or not _job_index_build.is_alive()):
+            _job_index_build = threading.Thread(target=_build_in_background, name="job-index-build", daemon=True)
+            _job_index_build.start()
+
+
+def wait_for_job_index(timeout: Optional[float] = None) -> Optional[MinHashLSH]:
+    """Wait for a background build to finish and get the index."""
+    build = _job_index_build
+    if build is not None:
+        build.join(timeout)
+    return _job_index
+
+
+def get_job_index() -> Optional[MinHashLSH]:
+    """
+    Get the job index caught up on logged changes, or None while it is being built.
+
+    A missing index (never built, or reset) is rebuilt in the background, so
+    no caller waits for a scan of the whole catalogue.
+    """
+    invalidation.watcher.poll()  # Outside the index lock: the watcher takes it while applying
+    start_job_index()
+    return _job_index
+
+
+def reset_job_index() -> None:
+    """Discard the job index; it is rebuilt in the background on next use."""
+    global _job_index, _pending, _generation
+    with _job_index_lock:
+        _job_index, _pending = None, None
+        _generation += 1
+
+
+def find_similar_jobs(
+    job: models.Job,
+    threshold: float,
+    limit: Optional[int] = None
+) -> Optional[List[Tuple[int, float]]]:
+    """
+    Find jobs similar to `job` (which need not be stored yet).
+
+    Returns:
+        List of (job_id, similarity) tuples, most similar first, or None if
+        the index is still being built
+    """
+    index = get_job_index()
+    if index is None:
+        return None
+    with _job_index_lock:
+        return index.query(_tokens_for(job), threshold, limit=limit, exclude=job.id)
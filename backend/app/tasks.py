@@ -0,0 +1,432 @@
+"""Local background task queue backed by the `tasks` table."""
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import insert, text, update
+from sqlalchemy.orm import Session
+from app import crud, matching, models, schemas, search, similarity
+from app.database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+# Worker threads started with the application (0 disables in-process workers)
+NUM_WORKERS = int(os.getenv("TASK_WORKERS", "2"))
+
+# How often idle workers look for new tasks
+POLL_INTERVAL_SECONDS = 0.5
+
+# Running tasks not updated for this long are assumed orphaned by a dead worker
+STALE_AFTER = timedelta(minutes=10)
+
+# Progress is written at most this often
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+class TaskContext:
+    """Handed to task handlers to report progress and checkpoint their work."""
+
+    def __init__(self, task_id: int, checkpoint: Any = None):
+        self.task_id = task_id
+        self.checkpoint = checkpoint  # Saved by an earlier attempt, or None
+        self._last_write = 0.0
+
+    def save_checkpoint(self, db: Session, state: Any) -> None:
+        """
+        Stage resume state in the handler's transaction.
+
+        It commits (or rolls back) with the work it describes, so a retried
+        attempt starts exactly after what the failed one committed.
+        """
+        db.execute(update(models.Task).where(models.Task.id == self.task_id).values(checkpoint=json.dumps(state)))
+        self.checkpoint = state
+
+    def progress(self, done: int, total: Optional[int] = None) -> None:
+        """Record progress (throttled; the final update is always written)."""
+        now = time.monotonic()
+        if now - self._last_write < PROGRESS_INTERVAL_SECONDS and (total is None or done < total):
+            return
+        self._last_write = now
+        values = {"progress": done, "updated_at": datetime.utcnow()}
+        if total is not None:
+            values["total"] = total
+        db = SessionLocal()
+        try:
+            db.execute(update(models.Task).where(models.Task.id == self.task_id).values(**values))
+            db.commit()
+        finally:
+            db.close()
+
+
+TaskHandler = Callable[[Session, dict, TaskContext], Any]
+_handlers: Dict[str, TaskHandler] = {}
+
+
+def task_handler(kind: str):
+    """Register a function as the handler for a task kind."""
+    def register(fn: TaskHandler) -> TaskHandler:
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def task_kinds() -> List[str]:
+    """Get the registered task kinds."""
+    return sorted(_handlers)
+
+
+# Wakes local workers as soon as a task is enqueued in this process
+_wakeup = threading.Event()
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    params: Optional[dict] = None,
+    max_attempts: int = 3,
+    commit: bool = True
+) -> models.Task:
+    """
+    Queue a task.
+
+    Args:
+        db: Database session
+        kind: Registered task kind
+        params: JSON-serializable handler parameters
+        max_attempts: Attempts before the task is marked failed
+        commit: Commit now; pass False to enqueue as part of the caller's transaction
+
+    Returns:
+        The queued task
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown task kind: {kind}")
+    task = models.Task(kind=kind, max_attempts=max_attempts)
+    task.set_params(params)
+    db.add(task)
+    if commit:
+        db.commit()
+        db.refresh(task)
+    _wakeup.set()
+    return task
+
+
+def get_task(db: Session, task_id: int) -> Optional[models.Task]:
+    """Get a task by ID."""
+    return db.query(models.Task).filter(models.Task.id == task_id).first()
+
+
+def get_task_matches(
+    db: Session,
+    task_id: int,
+    candidate_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[models.TaskMatch]:
+    """Get the matches stored by a recompute_matches task, by candidate and then best first."""
+    query = db.query(models.TaskMatch).filter(models.TaskMatch.task_id == task_id)
+    if candidate_id is not None:
+        query = query.filter(models.TaskMatch.candidate_id == candidate_id)
+    return (
+        query.order_by(models.TaskMatch.candidate_id, models.TaskMatch.rank)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def claim_next(db: Session) -> Optional[int]:
+    """
+    Atomically mark the next runnable task as running.
+
+    A single UPDATE ... RETURNING takes SQLite's write lock, so workers in
+    any process sharing the database never claim the same task.
+
+    Returns:
+        The claimed task ID, or None if nothing is runnable
+    """
+    now = datetime.utcnow()
+    runnable = (
+        db.query(models.Task.id)
+        .filter(models.Task.status == "queued", models.Task.run_after <= now)
+        .order_by(models.Task.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    task_id = db.execute(
+        update(models.Task)
+        .where(models.Task.id == runnable, models.Task.status == "queued")
+        .values(status="running", attempts=models.Task.attempts + 1, updated_at=now)
+        .returning(models.Task.id)
+    ).scalar()
+    db.commit()
+    return task_id
+
+
+def run_task(task_id: int) -> None:
+    """Run a claimed task, then record its result or schedule a retry."""
+    db = SessionLocal()
+    try:
+        task = get_task(db, task_id)
+        handler = _handlers.get(task.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown task kind: {task.kind}")
+            result = handler(db, task.get_params(), TaskContext(task_id, task.get_checkpoint()))
+        except Exception:
+            db.rollback()
+            task = get_task(db, task_id)
+            task.error = traceback.format_exc(limit=5)
+            if task.attempts < task.max_attempts:
+                task.status = "queued"
+                task.run_after = datetime.utcnow() + timedelta(seconds=2 ** task.attempts)
+            else:
+                task.status = "failed"
+            logger.exception("Task %s (%s) attempt %s failed", task_id, task.kind, task.attempts)
+        else:
+            task = get_task(db, task_id)
+            db.refresh(task)  # Pick up progress written by the handler's context
+            task.set_result(result)
+            task.checkpoint = None
+            task.status = "succeeded"
+            task.error = None
+            if task.total is not None:
+                task.progress = task.total
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_next() -> bool:
+    """Claim and run one task. Returns False if none was runnable."""
+    db = SessionLocal()
+    try:
+        task_id = claim_next(db)
+    finally:
+        db.close()
+    if task_id is None:
+        return False
+    run_task(task_id)
+    return True
+
+
+def requeue_stale(db: Session) -> int:
+    """Requeue running tasks whose worker appears to have died."""
+    cutoff = datetime.utcnow() - STALE_AFTER
+    count = db.execute(
+        update(models.Task)
+        .where(models.Task.status == "running", models.Task.updated_at < cutoff)
+        .values(status="queued", run_after=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    return count
+
+
+class TaskWorkerPool:
+    """Threads that claim and run queued tasks until stopped."""
+
+    def __init__(self, num_workers: int):
+        self.num_workers = num_workers
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        db = SessionLocal()
+        try:
+            requeued = requeue_stale(db)
+        finally:
+            db.close()
+        if requeued:
+            logger.warning("Requeued %s stale task(s)", requeued)
+        for index in range(self.num_workers):
+            thread = threading.Thread(target=self._work, name=f"task-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if run_next():
+                    continue
+            except Exception:
+                logger.exception("Task worker error")
+            _wakeup.wait(POLL_INTERVAL_SECONDS)
+            _wakeup.clear()
+
+    def stop(self) -> None:
+        self._stop.set()
+        _wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+
+_pool: Optional[TaskWorkerPool] = None
+
+
+def start_workers() -> None:
+    """Start the in-process worker pool (no-op if TASK_WORKERS is 0)."""
+    global _pool
+    if NUM_WORKERS > 0 and _pool is None:
+        _pool = TaskWorkerPool(NUM_WORKERS)
+        _pool.start()
+
+
+def stop_workers() -> None:
+    """Stop the in-process worker pool."""
+    global _pool
+    if _pool is not None:
+        _pool.stop()
+        _pool = None
+
+
+# Task handlers
+def _batches(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@task_handler("import")
+def import_catalogue(db: Session, params: dict, ctx: TaskContext) -> dict:
+    """
+    Bulk-create jobs and candidates in batches (the seed_data.py format).
+
+    Each batch commits together with a checkpoint of the IDs created so far
+    (one per input item), so a retry resumes after the last committed batch
+    instead of inserting it again.
+    """
+    jobs = [schemas.JobCreate(**job) for job in params.get("jobs", [])]
+    candidates = [schemas.CandidateCreate(**candidate) for candidate in params.get("candidates", [])]
+    batch_size = int(params.get("batch_size", 500))
+    state = ctx.checkpoint or {"job_ids": [], "candidate_ids": []}
+    job_ids, candidate_ids = state["job_ids"], state["candidate_ids"]
+    total = len(jobs) + len(candidates)
+    ctx.progress(len(job_ids) + len(candidate_ids), total)
+
+    for batch in _batches(jobs[len(job_ids):], batch_size):
+        created = crud.create_jobs(db, batch, on_duplicate=params.get("on_duplicate"), commit=False)
+        job_ids.extend(job.id for job in created)
+        ctx.save_checkpoint(db, state)
+        db.commit()
+        ctx.progress(len(job_ids), total)
+    for batch in _batches(candidates[len(candidate_ids):], batch_size):
+        candidate_ids.extend(candidate.id for candidate in crud.create_candidates(db, batch, commit=False))
+        ctx.save_checkpoint(db, state)
+        db.commit()
+        ctx.progress(len(job_ids) + len(candidate_ids), total)
+    return {"job_ids": job_ids, "candidate_ids": candidate_ids}
+
+
+@task_handler("rebuild_search_index")
+def rebuild_search(db: Session, params: dict, ctx: TaskContext) -> dict:
+    """Re-index every job in the FTS5 table."""
+    search.rebuild_search_index(db.connection())
+    db.commit()
+    return {"jobs": crud.count_jobs(db)}
+
+
+@task_handler("rebuild_skill_postings")
+def rebuild_skill_postings(db: Session, params: dict, ctx: TaskContext) -> dict:
+    """Rebuild the job_skills and candidate_skills postings from the skill lists."""
+    db.execute(text("DELETE FROM job_skills"))
+    db.execute(text(
+        "INSERT OR IGNORE INTO job_skills (job_id, skill) "
+        "SELECT jobs.id, json_each.value FROM jobs, json_each(jobs.required_skills)"
+    ))
+    db.execute(text("DELETE FROM candidate_skills"))
+    db.execute(text(
+        "INSERT OR IGNORE INTO candidate_skills (candidate_id, skill) "
+        "SELECT candidates.id, json_each.value FROM candidates, json_each(candidates.skills)"
+    ))
+    db.commit()
+    return {
+        "postings": db.query(models.JobSkill).count(),
+        "candidate_postings": db.query(models.CandidateSkill).count(),
+    }
+
+
+@task_handler("rebuild_skill_stats")
+def rebuild_skill_stats(db: Session, params: dict, ctx: TaskContext) -> dict:
+    """Recount the per-skill demand/supply counters from scratch."""
+    db.execute(text("DELETE FROM skill_stats"))
+    db.execute(text(models.SKILL_STATS_BACKFILL))
+    db.commit()
+    return {"skills": db.query(models.SkillStat).count()}
+
+
+@task_handler("compress_descriptions")
+def compress_descriptions(db: Session, params: dict, ctx: TaskContext) -> dict:
+    """Compress descriptions over the threshold; `vacuum` also shrinks the database file."""
+    compressed = crud.compress_job_descriptions(db)
+    if params.get("vacuum"):
+        db.close()
+        with engine.connect() as conn:
+            conn.execute(text("VACUUM"))
+    return {"compressed": compressed}
+
+
+@task_handler("percolate_jobs")
+def percolate_jobs(db: Session, params: dict, ctx: TaskContext) -> dict:
+    """Notify candidates whose alert threshold the new `job_ids` meet (queued by job creation)."""
+    job_ids = params["job_ids"]
+    notified = 0
+    for done, batch in enumerate(_batches(job_ids, 100)):
+        for job in crud.get_jobs_by_ids(db, batch):
+            notified += crud.create_notifications(db, job.id, crud.find_alerted_candidates(db, job))
+        ctx.progress(min((done + 1) * 100, len(job_ids)), len(job_ids))
+    return {"jobs": len(job_ids), "notifications": notified}
+
+
+@task_handler("rebuild_similarity_index")
+def rebuild_similarity_index(db: Session, params: dict, ctx: TaskContext) -> dict:
+    """Rebuild this process's MinHash/LSH job index from the database."""
+    similarity.reset_job_index()
+    return {"jobs": len(similarity.build_job_index(db))}
+
+
+@task_handler("recompute_matches")
+def recompute_matches(db: Session, params: dict, ctx: TaskContext) -> dict:
+    """
+    Score the catalogue for every candidate (or `candidate_ids`) and store each
+    candidate's `top_k` (default 10) matches in `task_matches`.
+
+    Matches are committed per batch of candidates with a checkpoint, so a
+    retried attempt carries on after the last committed batch.
+    """
+    top_k = int(params.get("top_k", 10))
+    candidate_ids = params.get("candidate_ids")
+    if candidate_ids is None:
+        candidate_ids = [candidate_id for (candidate_id,) in db.query(models.Candidate.id)]
+    candidate_ids = sorted(set(candidate_ids))
+    state = ctx.checkpoint or {"after": 0, "candidates": 0, "matches": 0}
+    remaining = [candidate_id for candidate_id in candidate_ids if candidate_id > state["after"]]
+    jobs = crud.get_all_jobs(db, limit=None)
+
+    done = len(candidate_ids) - len(remaining)
+    for candidates in _batches(remaining, 100):
+        rows = []
+        for candidate in crud.get_candidates_by_ids(db, candidates):
+            matches = matching.get_job_matches(candidate, jobs, top_k=top_k)
+            rows.extend(
+                {
+                    "task_id": ctx.task_id,
+                    "candidate_id": candidate.id,
+                    "rank": rank,
+                    "job_id": match["jobId"],
+                    "match_score": match["matchScore"],
+                }
+                for rank, match in enumerate(matches)
+            )
+            state = {**state, "candidates": state["candidates"] + 1}
+        if rows:
+            db.execute(insert(models.TaskMatch), rows)
+        state = {**state, "after": candidates[-1], "matches": state["matches"] + len(rows)}
+        ctx.save_checkpoint(db, state)
+        db.commit()
+        done += len(candidates)
+        ctx.progress(done, len(candidate_ids))
+    return {"candidates": state["candidates"], "matches": state["matches"]}
@@ -0,0 +1,154 @@
+"""Benchmark database size and read performance with and without description compression.
+
+Usage:
+    python benchmark_descriptions.py            # 20000 jobs
+    python benchmark_descriptions.py --jobs 5000
+
+Builds two temporary databases with the same generated catalogue, one with
+compression disabled and one with the default threshold, and reports file
+size, bytes and pages used by the `jobs` and `changes` tables, how much of that table fits
+in SQLite's default page cache, and best-of-5 timings for raw scans, ORM
+loads of the whole catalogue and serialization of one API page (which pays
+for decompression).
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+WORDS = (
+    "we are hiring engineers to design build and operate scalable services for our customers "
+    "you will work with product design and data teams on distributed systems observability "
+    "security performance testing deployment pipelines and developer tooling across the stack "
+    "requirements include strong communication ownership mentoring experience with cloud "
+    "infrastructure databases queues caching and modern web frameworks benefits include "
+    "remote work flexible hours learning budget health insurance and equity"
+).split()
+SKILLS = ["Python", "FastAPI", "Docker", "AWS", "React", "SQL", "Go", "Kubernetes", "Terraform", "Java"]
+
+
+def _catalogue(count: int):
+    rng = random.Random(42)
+    for i in range(count):
+        length = rng.randint(150, 900)  # Roughly 1-6 KB of text
+        yield {
+            "title": f"Engineer {i}",
+            "description": " ".join(rng.choice(WORDS) for _ in range(length)),
+            "required_skills": rng.sample(SKILLS, rng.randint(2, 5)),
+            "min_years_experience": rng.randint(0, 8),
+        }
+
+
+def _measure(job_count: int) -> dict:
+    """Run inside a child process whose environment selects the database and threshold."""
+    from sqlalchemy import text
+    from app import crud, schemas
+    from app.database import SessionLocal, engine, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        # A third through each write path, since single-row writes also log change events
+        jobs = list(_catalogue(job_count))
+        third = len(jobs) // 3
+        bulk = [schemas.JobCreate(**job) for job in jobs[:third]]
+        for start in range(0, len(bulk), 1000):
+            crud.create_jobs(db, bulk[start:start + 1000], on_duplicate="allow")
+        for job in jobs[third:2 * third]:
+            crud.create_job(db, schemas.JobCreate(**job), on_duplicate="allow")
+        feed = [schemas.JobUpsert(external_id=str(i), **job) for i, job in enumerate(jobs[2 * third:])]
+        crud.upsert_jobs(db, feed)
+        for item in feed:  # Re-sent with edits: one update event per job
+            item.description += " updated"
+        crud.upsert_jobs(db, feed)
+    finally:
+        db.close()
+
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+        table_bytes, table_pages = conn.execute(
+            text("SELECT SUM(pgsize), COUNT(*) FROM dbstat WHERE name = 'jobs'")
+        ).one()
+        changes_bytes = conn.execute(text("SELECT SUM(pgsize) FROM dbstat WHERE name = 'changes'")).scalar()
+        cache_pages = -conn.execute(text("PRAGMA cache_size")).scalar() * 1024 // conn.execute(
+            text("PRAGMA page_size")
+        ).scalar()
+
+    def timed(fn, repeat=5):
+        best = float("inf")
+        for _ in range(repeat):
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                fn(db)
+                best = min(best, time.perf_counter() - started)
+            finally:
+                db.close()
+        return round(best * 1000, 1)
+
+    def scan_rows(db):
+        # Storage cost alone: every column of every row, no ORM
+        for _ in db.connection().exec_driver_sql("SELECT * FROM jobs"):
+            pass
+
+    def scan_match_columns(db):
+        # The columns matching reads; long inline descriptions spread them over more pages
+        for _ in db.connection().exec_driver_sql(
+            "SELECT id, title, required_skills, min_years_experience FROM jobs"
+        ):
+            pass
+
+    def load_all(db):
+        # What matching does: every row, description never read
+        for job in crud.get_all_jobs(db, limit=None):
+            job.get_skills_list()
+
+    def serialize_page(db):
+        # What GET /jobs does: one page, every field serialized
+        [schemas.JobResponse.model_validate(job).model_dump() for job in crud.get_all_jobs(db, limit=100)]
+
+    return {
+        "file_bytes": os.path.getsize(engine.url.database),
+        "jobs_table_bytes": table_bytes,
+        "jobs_table_pages": table_pages,
+        "changes_table_bytes": changes_bytes,
+        "share_in_page_cache": round(min(1.0, cache_pages / table_pages), 3),
+        "scan_rows_ms": timed(scan_rows),
+        "scan_match_columns_ms": timed(scan_match_columns),
+        "orm_load_all_ms": timed(load_all),
+        "serialize_page_ms": timed(serialize_page),
+    }
+
+
+def main():
+    job_count = int(sys.argv[sys.argv.index("--jobs") + 1]) if "--jobs" in sys.argv else 20000
+    if "--child" in sys.argv:
+        print(json.dumps(_measure(job_count)))
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for label, threshold in [("uncompressed", str(2 ** 62)), ("compressed", os.getenv("DESCRIPTION_COMPRESSION_THRESHOLD", "1024"))]:
+            env = dict(
+                os.environ,
+                DATABASE_URL=f"sqlite:///{os.path.join(directory, label + '.db')}",
+                DESCRIPTION_COMPRESSION_THRESHOLD=threshold,
+                CATALOGUE_POLL_INTERVAL="0",
+            )
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", "--jobs", str(job_count)],
+                env=env, check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+            ).stdout
+            results[label] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{job_count} jobs")
+    print(f"{'metric':<22}{'uncompressed':>15}{'compressed':>15}")
+    for metric in results["uncompressed"]:
+        print(f"{metric:<22}{results['uncompressed'][metric]:>15}{results['compressed'][metric]:>15}")
+
+
+if __name__ == "__main__":
+    main()
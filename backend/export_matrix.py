@@ -0,0 +1,255 @@
+"""Export the candidate x job match score matrix, with jobs and candidates, as columnar files.
+
+Usage:
+    python export_matrix.py                              # Arrow IPC files in ./export
+    python export_matrix.py --out /data/matches --format parquet
+    python export_matrix.py --min-score 70 --workers 4   # Only rows scoring 70 or more
+
+Writes `matches`, `jobs` and `candidates` files (`.arrow` or `.parquet`) to
+the output directory. The matrix has one (candidate_id, job_id, match_score)
+row per pair, grouped by candidate and then by job ID. Candidates are read
+and scored in batches by worker processes and each batch is written as soon
+as it is scored, so memory stays bounded by `--chunk-rows` per batch in
+flight rather than by the size of the matrix.
+
+Requires pyarrow, which the API itself does not need: pip install pyarrow
+"""
+import argparse
+import os
+import time
+from array import array
+from collections import deque
+from multiprocessing import get_context
+from typing import List, Tuple
+from app import crud, matching, models
+from app.database import SessionLocal, init_db
+
+# A candidate as sent to the workers: (id, skills, years of experience)
+CandidateRow = Tuple[int, List[str], int]
+
+_scorer = None  # Each worker's CatalogueScorer
+
+
+def _load_pyarrow(fmt: str):
+    """Import pyarrow (and pyarrow.parquet) only when exporting, with an actionable error."""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        if fmt == "parquet":
+            import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise SystemExit("export_matrix.py needs pyarrow, which is not installed: pip install pyarrow")
+    return pyarrow
+
+
+def _init_worker(jobs: List[Tuple[int, List[str], int]]) -> None:
+    global _scorer
+    _scorer = matching.CatalogueScorer(jobs)
+
+
+def _score_batch(candidates: List[CandidateRow], min_score: int) -> Tuple[array, array, array]:
+    """Score a batch of candidates against the whole catalogue as three packed columns."""
+    candidate_ids, job_ids, scores = array("q"), array("q"), array("B")
+    for candidate_id, skills, years_experience in candidates:
+        for job_id, score in _scorer.score(skills, years_experience, min_score):
+            job_ids.append(job_id)
+            scores.append(score)
+        candidate_ids.extend([candidate_id] * (len(job_ids) - len(candidate_ids)))
+    return candidate_ids, job_ids, scores
+
+
+class _Writer:
+    """Appends record batches to one Arrow IPC or Parquet file."""
+
+    def __init__(self, pa, path: str, schema, fmt: str):
+        self._pa = pa
+        self.rows = 0
+        if fmt == "parquet":
+            self._writer = pa.parquet.ParquetWriter(path, schema)
+        else:
+            self._writer = pa.ipc.new_file(path, schema)
+
+    def write(self, batch) -> None:
+        if batch.num_rows:
+            self._writer.write_table(self._pa.Table.from_batches([batch]))
+            self.rows += batch.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _packed(pa, values: array, arrow_type):
+    """Wrap a packed array as an Arrow array without copying."""
+    return pa.Array.from_buffers(arrow_type, len(values), [None, pa.py_buffer(values)])
+
+
+def _candidate_batches(db, batch_size: int):
+    rows = db.query(models.Candidate.id, models.Candidate.skills, models.Candidate.years_experience)
+    batch = []
+    for candidate_id, skills, years_experience in rows.order_by(models.Candidate.id).yield_per(batch_size):
+        batch.append((candidate_id, models.Candidate(skills=skills).get_skills_list(), years_experience))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_matrix(pa, db, path: str, fmt: str, metadata: dict, min_score: int, workers: int, chunk_rows: int) -> int:
+    """
+    Score every candidate against every job and stream the rows to `path`.
+
+    Args:
+        pa: The pyarrow module
+        db: Database session
+        path: Output file
+        fmt: "arrow" or "parquet"
+        metadata: Key/value strings stored in the file's schema
+        min_score: Only write pairs scoring at least this
+        workers: Scoring processes (0 scores in this process)
+        chunk_rows: Target matrix rows per batch, which bounds memory per batch
+
+    Returns:
+        Number of rows written
+    """
+    jobs = [
+        (job_id, models.Job(required_skills=required_skills).get_skills_list(), min_years_experience)
+        for job_id, required_skills, min_years_experience in db.query(
+            models.Job.id, models.Job.required_skills, models.Job.min_years_experience
+        ).order_by(models.Job.id)
+    ]
+    schema = pa.schema(
+        [("candidate_id", pa.int64()), ("job_id", pa.int64()), ("match_score", pa.uint8())],
+        metadata={**metadata, "min_score": str(min_score)}
+    )
+    writer = _Writer(pa, path, schema, fmt)
+
+    def write(columns: Tuple[array, array, array]) -> None:
+        candidate_ids, job_ids, scores = columns
+        writer.write(pa.record_batch(
+            [_packed(pa, candidate_ids, pa.int64()), _packed(pa, job_ids, pa.int64()), _packed(pa, scores, pa.uint8())],
+            schema=schema
+        ))
+
+    batches = _candidate_batches(db, max(1, chunk_rows // max(1, len(jobs))))
+    try:
+        if workers <= 0:
+            _init_worker(jobs)
+            for batch in batches:
+                write(_score_batch(batch, min_score))
+        else:
+            with get_context("spawn").Pool(workers, initializer=_init_worker, initargs=(jobs,)) as pool:
+                in_flight = deque()  # Bounded, so unwritten results cannot pile up
+                for batch in batches:
+                    in_flight.append(pool.apply_async(_score_batch, (batch, min_score)))
+                    if len(in_flight) >= 2 * workers:
+                        write(in_flight.popleft().get())
+                while in_flight:
+                    write(in_flight.popleft().get())
+    finally:
+        writer.close()
+    return writer.rows
+
+
+def export_jobs(pa, db, path: str, fmt: str, metadata: dict, chunk_rows: int) -> int:
+    """Write every job to `path`, `chunk_rows` rows per batch. Returns the number of rows."""
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("required_skills", pa.list_(pa.string())),
+        ("min_years_experience", pa.int32()),
+        ("duplicate_of", pa.int64()),
+        ("external_id", pa.string()),
+    ], metadata=metadata)
+    writer = _Writer(pa, path, schema, fmt)
+    try:
+        chunk = []
+        for job in db.query(models.Job).order_by(models.Job.id).yield_per(chunk_rows):
+            chunk.append({
+                "id": job.id,
+                "title": job.title,
+                "description": job.description,
+                "required_skills": job.get_skills_list(),
+                "min_years_experience": job.min_years_experience,
+                "duplicate_of": job.duplicate_of,
+                "external_id": job.external_id,
+            })
+            if len(chunk) == chunk_rows:
+                writer.write(pa.RecordBatch.from_pylist(chunk, schema=schema))
+                chunk = []
+        writer.write(pa.RecordBatch.from_pylist(chunk, schema=schema))
+    finally:
+        writer.close()
+    return writer.rows
+
+
+def export_candidates(pa, db, path: str, fmt: str, metadata: dict, chunk_rows: int) -> int:
+    """Write every candidate to `path`, `chunk_rows` rows per batch. Returns the number of rows."""
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string()),
+        ("skills", pa.list_(pa.string())),
+        ("years_experience", pa.int32()),
+        ("alert_threshold", pa.int32()),
+        ("external_id", pa.string()),
+    ], metadata=metadata)
+    writer = _Writer(pa, path, schema, fmt)
+    try:
+        chunk = []
+        for candidate in db.query(models.Candidate).order_by(models.Candidate.id).yield_per(chunk_rows):
+            chunk.append({
+                "id": candidate.id,
+                "name": candidate.name,
+                "skills": candidate.get_skills_list(),
+                "years_experience": candidate.years_experience,
+                "alert_threshold": candidate.alert_threshold,
+                "external_id": candidate.external_id,
+            })
+            if len(chunk) == chunk_rows:
+                writer.write(pa.RecordBatch.from_pylist(chunk, schema=schema))
+                chunk = []
+        writer.write(pa.RecordBatch.from_pylist(chunk, schema=schema))
+    finally:
+        writer.close()
+    return writer.rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the match score matrix, jobs and candidates as columnar files.")
+    parser.add_argument("--out", default="export", help="Output directory (default: export)")
+    parser.add_argument("--format", choices=["arrow", "parquet"], default="arrow", help="Arrow IPC file or Parquet")
+    parser.add_argument("--min-score", type=int, default=0, help="Only export pairs scoring at least this")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Scoring processes (0: in-process)")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000, help="Target matrix rows per written batch")
+    args = parser.parse_args()
+
+    pa = _load_pyarrow(args.format)
+    init_db()
+    os.makedirs(args.out, exist_ok=True)
+    extension = "parquet" if args.format == "parquet" else "arrow"
+
+    db = SessionLocal()
+    try:
+        # Tag every file with the catalogue version it was read at
+        start_seq = crud.get_latest_change_seq(db)
+        metadata = {"change_seq": str(start_seq)}
+        started = time.perf_counter()
+        for name, export in [
+            ("jobs", lambda path: export_jobs(pa, db, path, args.format, metadata, 10_000)),
+            ("candidates", lambda path: export_candidates(pa, db, path, args.format, metadata, 10_000)),
+            ("matches", lambda path: export_matrix(
+                pa, db, path, args.format, metadata, args.min_score, args.workers, args.chunk_rows
+            )),
+        ]:
+            path = os.path.join(args.out, f"{name}.{extension}")
+            rows = export(path)
+            print(f"  ✓ {path}: {rows} rows ({time.perf_counter() - started:.1f}s)")
+        if crud.get_latest_change_seq(db) != start_seq:
+            print("Warning: the catalogue changed during the export; files may disagree slightly. Re-run for a clean snapshot.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
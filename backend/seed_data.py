@@ -4,11 +4,122 @@ Usage:
     # Run locally (requires dependencies installed)
     python seed_data.py
     
+    # Or queue the import as a background task for the API's task workers
+    python seed_data.py --queue
+    
     # Or run in Docker container
     docker exec job-matching-backend python -c "$(cat seed_data.py)"
 """
+import sys
 from app.database import init_db, SessionLocal
-from app import crud, schemas
+from app import crud, schemas, tasks
+
+# Sample Jobs
+JOBS_DATA = [
+    {
+        "title": "Senior Python Developer",
+        "description": "We are looking for an experienced Python developer to join our backend team. You'll work on building scalable APIs and microservices.",
+        "required_skills": ["Python", "FastAPI", "Docker", "PostgreSQL", "AWS"],
+        "min_years_experience": 5
+    },
+    {
+        "title": "Full Stack Engineer",
+        "description": "Join our team to build modern web applications using React and Python. Experience with both frontend and backend is required.",
+        "required_skills": ["Python", "JavaScript", "React", "FastAPI", "Docker"],
+        "min_years_experience": 3
+    },
+    {
+        "title": "DevOps Engineer",
+        "description": "Looking for a DevOps engineer to manage our cloud infrastructure and CI/CD pipelines.",
+        "required_skills": ["Docker", "Kubernetes", "AWS", "Terraform", "CI/CD"],
+        "min_years_experience": 4
+    },
+    {
+        "title": "Junior Software Engineer",
+        "description": "Great opportunity for a junior developer to learn and grow. We'll provide mentorship and training.",
+        "required_skills": ["Python", "JavaScript"],
+        "min_years_experience": 1
+    },
+    {
+        "title": "Machine Learning Engineer",
+        "description": "Work on cutting-edge ML models and deploy them to production. Experience with PyTorch or TensorFlow required.",
+        "required_skills": ["Python", "PyTorch", "TensorFlow", "Docker", "AWS"],
+        "min_years_experience": 3
+    },
+    {
+        "title": "Backend API Developer",
+        "description": "Build robust RESTful APIs and microservices. Experience with FastAPI or Flask required.",
+        "required_skills": ["Python", "FastAPI", "PostgreSQL", "Docker"],
+        "min_years_experience": 2
+    },
+    {
+        "title": "Frontend Developer",
+        "description": "Create beautiful and responsive user interfaces. Strong React and CSS skills required.",
+        "required_skills": ["JavaScript", "React", "CSS", "HTML"],
+        "min_years_experience": 2
+    },
+    {
+        "title": "Cloud Architect",
+        "description": "Design and implement cloud infrastructure solutions. Deep AWS knowledge required.",
+        "required_skills": ["AWS", "Terraform", "Docker", "Kubernetes", "CI/CD"],
+        "min_years_experience": 6
+    }
+]
+
+# Sample Candidates
+CANDIDATES_DATA = [
+    {
+        "name": "Alice Johnson",
+        "skills": ["Python", "FastAPI", "Docker", "PostgreSQL", "AWS"],
+        "years_experience": 6
+    },
+    {
+        "name": "Bob Smith",
+        "skills": ["Python", "JavaScript", "React", "FastAPI"],
+        "years_experience": 4
+    },
+    {
+        "name": "Charlie Brown",
+        "skills": ["Docker", "Kubernetes", "AWS", "Terraform"],
+        "years_experience": 5
+    },
+    {
+        "name": "Diana Prince",
+        "skills": ["Python", "JavaScript"],
+        "years_experience": 1
+    },
+    {
+        "name": "Eve Williams",
+        "skills": ["Python", "PyTorch", "TensorFlow", "Docker"],
+        "years_experience": 3
+    },
+    {
+        "name": "Frank Miller",
+        "skills": ["Python", "FastAPI", "Docker"],
+        "years_experience": 2
+    },
+    {
+        "name": "Grace Lee",
+        "skills": ["JavaScript", "React", "CSS", "HTML"],
+        "years_experience": 3
+    },
+    {
+        "name": "Henry Davis",
+        "skills": ["AWS", "Docker", "Kubernetes"],
+        "years_experience": 7
+    },
+    {
+        "name": "Iris Chen",
+        "skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "AWS"],
+        "years_experience": 4
+    },
+    {
+        "name": "Jack Wilson",
+        "skills": ["Python", "Docker"],
+        "years_experience": 1
+    }
+]
+
 
 def seed_database():
     """Create sample jobs and candidates."""
@@ -20,60 +131,9 @@ def seed_database():
     try:
         print("Creating sample jobs...")
         
-        # Sample Jobs
-        jobs_data = [
-            {
-                "title": "Senior Python Developer",
-                "description": "We are looking for an experienced Python developer to join our backend team. You'll work on building scalable APIs and microservices.",
-                "required_skills": ["Python", "FastAPI", "Docker", "PostgreSQL", "AWS"],
-                "min_years_experience": 5
-            },
-            {
-                "title": "Full Stack Engineer",
-                "description": "Join our team to build modern web applications using React and Python. Experience with both frontend and backend is required.",
-                "required_skills": ["Python", "JavaScript", "React", "FastAPI", "Docker"],
-                "min_years_experience": 3
-            },
-            {
-                "title": "DevOps Engineer",
-                "description": "Looking for a DevOps engineer to manage our cloud infrastructure and CI/CD pipelines.",
-                "required_skills": ["Docker", "Kubernetes", "AWS", "Terraform", "CI/CD"],
-                "min_years_experience": 4
-            },
-            {
-                "title": "Junior Software Engineer",
-                "description": "Great opportunity for a junior developer to learn and grow. We'll provide mentorship and training.",
-                "required_skills": ["Python", "JavaScript"],
-                "min_years_experience": 1
-            },
-            {
-                "title": "Machine Learning Engineer",
-                "description": "Work on cutting-edge ML models and deploy them to production. Experience with PyTorch or TensorFlow required.",
-                "required_skills": ["Python", "PyTorch", "TensorFlow", "Docker", "AWS"],
-                "min_years_experience": 3
-            },
-            {
-                "title": "Backend API Developer",
-                "description": "Build robust RESTful APIs and microservices. Experience with FastAPI or Flask required.",
-                "required_skills": ["Python", "FastAPI", "PostgreSQL", "Docker"],
-                "min_years_experience": 2
-            },
-            {
-                "title": "Frontend Developer",
-                "description": "Create beautiful and responsive user interfaces. Strong React and CSS skills required.",
-                "required_skills": ["JavaScript", "React", "CSS", "HTML"],
-                "min_years_experience": 2
-            },
-            {
-                "title": "Cloud Architect",
-                "description": "Design and implement cloud infrastructure solutions. Deep AWS knowledge required.",
-                "required_skills": ["AWS", "Terraform", "Docker", "Kubernetes", "CI/CD"],
-                "min_years_experience": 6
-            }
-        ]
         
         created_jobs = []
-        for job_data in jobs_data:
+        for job_data in JOBS_DATA:
             job = crud.create_job(db=db, job=schemas.JobCreate(**job_data))
             created_jobs.append(job)
             print(f"  ✓ Created job: {job.title} (ID: {job.id})")
@@ -82,62 +142,9 @@ def seed_database():
         
         print("\nCreating sample candidates...")
         
-        # Sample Candidates
-        candidates_data = [
-            {
-                "name": "Alice Johnson",
-                "skills": ["Python", "FastAPI", "Docker", "PostgreSQL", "AWS"],
-                "years_experience": 6
-            },
-            {
-                "name": "Bob Smith",
-                "skills": ["Python", "JavaScript", "React", "FastAPI"],
-                "years_experience": 4
-            },
-            {
-                "name": "Charlie Brown",
-                "skills": ["Docker", "Kubernetes", "AWS", "Terraform"],
-                "years_experience": 5
-            },
-            {
-                "name": "Diana Prince",
-                "skills": ["Python", "JavaScript"],
-                "years_experience": 1
-            },
-            {
-                "name": "Eve Williams",
-                "skills": ["Python", "PyTorch", "TensorFlow", "Docker"],
-                "years_experience": 3
-            },
-            {
-                "name": "Frank Miller",
-                "skills": ["Python", "FastAPI", "Docker"],
-                "years_experience": 2
-            },
-            {
-                "name": "Grace Lee",
-                "skills": ["JavaScript", "React", "CSS", "HTML"],
-                "years_experience": 3
-            },
-            {
-                "name": "Henry Davis",
-                "skills": ["AWS", "Docker", "Kubernetes"],
-                "years_experience": 7
-            },
-            {
-                "name": "Iris Chen",
-                "skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "AWS"],
-                "years_experience": 4
-            },
-            {
-                "name": "Jack Wilson",
-                "skills": ["Python", "Docker"],
-                "years_experience": 1
-            }
-        ]
         
         created_candidates = []
-        for candidate_data in candidates_data:
+        for candidate_data in CANDIDATES_DATA:
             candidate = crud.create_candidate(db=db, candidate=schemas.CandidateCreate(**candidate_data))
             created_candidates.append(candidate)
             print(f"  ✓ Created candidate: {candidate.name} (ID: {candidate.id})")
@@ -173,6 +180,20 @@ def seed_database():
         db.close()
 
 
+def queue_seed_import():
+    """Queue the sample data as an import task instead of inserting it inline."""
+    init_db()
+    db = SessionLocal()
+    try:
+        task = tasks.enqueue(db, "import", {"jobs": JOBS_DATA, "candidates": CANDIDATES_DATA})
+        print(f"Queued import task {task.id}; follow it at GET /tasks/{task.id}")
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
-    seed_database()
+    if "--queue" in sys.argv[1:]:
+        queue_seed_import()
+    else:
+        seed_database()
 
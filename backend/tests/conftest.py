@@ -0,0 +1,31 @@
+"""Shared test fixtures."""
+import pytest
+from app import models, schemas, similarity  # noqa: F401  # Register models on Base
+from app.database import Base, engine, SessionLocal
+
+
+@pytest.fixture
+def db():
+    """Create a test database session."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    similarity.build_job_index(db)  # Built in the background at application startup
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+        similarity.reset_job_index()  # In-process index would outlive the dropped tables
+
+
+@pytest.fixture
+def make_job():
+    """Build job payloads, defaulting the fields a test does not care about."""
+    def make(title="Data Engineer", skills=("Python",), years=1, description="Description"):
+        return schemas.JobCreate(
+            title=title,
+            description=description,
+            required_skills=list(skills),
+            min_years_experience=years
+        )
+    return make
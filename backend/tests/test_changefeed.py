@@ -0,0 +1,66 @@
+"""Unit tests for change log consumers."""
+from sqlalchemy.orm import Session
+from app import crud, schemas
+from app.changefeed import compute_match_deltas
+from app.database import SessionLocal, engine
+
+
+def test_match_deltas_score_only_affected_jobs(db: Session, make_job):
+    """Test that job changes become added/updated/removed deltas."""
+    candidate = crud.create_candidate(db=db, candidate=schemas.CandidateCreate(
+        name="John Doe",
+        skills=["Python", "Docker"],
+        years_experience=3
+    ))
+    start = crud.get_latest_change_seq(db=db)
+    
+    job = crud.create_job(db=db, job=make_job("Backend", ["Python", "FastAPI"]))
+    bulk = crud.create_jobs(db=db, jobs=[make_job("DevOps", ["Docker"])])
+    crud.update_job(db=db, job_id=job.id, job_update=schemas.JobUpdate(required_skills=["Python"]))
+    crud.delete_job(db=db, job_id=job.id)
+    
+    changes = crud.get_changes(db=db, since=start)
+    candidate, deltas = compute_match_deltas(candidate, changes)
+    
+    assert candidate is not None
+    assert [(event, data.get("jobId")) for _, event, data in deltas] == [
+        ("added", job.id),
+        ("added", bulk[0].id),
+        ("updated", job.id),
+        ("removed", job.id),
+    ]
+    assert deltas[0][2]["matchScore"] == 65
+    assert deltas[2][2]["matchScore"] == 100
+
+
+def test_match_deltas_candidate_changes(db: Session):
+    """Test that candidate updates reset the stream and deletes close it."""
+    candidate = crud.create_candidate(db=db, candidate=schemas.CandidateCreate(
+        name="John Doe",
+        skills=["Python"],
+        years_experience=3
+    ))
+    start = crud.get_latest_change_seq(db=db)
+    
+    checked_out = engine.pool.checkedout()
+    # Streams keep a detached candidate between wake-ups
+    stream_db = SessionLocal()
+    try:
+        streamed = crud.get_candidate(db=stream_db, candidate_id=candidate.id)
+    finally:
+        stream_db.close()
+    crud.update_candidate(
+        db=db,
+        candidate_id=candidate.id,
+        candidate_update=schemas.CandidateUpdate(years_experience=4)
+    )
+    reloaded, deltas = compute_match_deltas(streamed, crud.get_changes(db=db, since=start))
+    assert [event for _, event, _ in deltas] == ["reset"]
+    assert reloaded.years_experience == 4
+    
+    crud.delete_candidate(db=db, candidate_id=candidate.id)
+    result, deltas = compute_match_deltas(reloaded, crud.get_changes(db=db, since=start))
+    
+    assert result is None
+    assert [event for _, event, _ in deltas] == ["reset", "closed"]
+    assert engine.pool.checkedout() == checked_out  # Nothing left holding a connection
@@ -0,0 +1,43 @@
+"""Unit tests for compressed job descriptions."""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app import compression, crud, schemas, search
+
+
+LONG_DESCRIPTION = "We build distributed ingestion pipelines for logistics data. " * 40
+
+
+def test_long_descriptions_are_stored_compressed(db: Session, make_job):
+    """Test that long descriptions round-trip through compression and stay searchable."""
+    job = crud.create_job(db=db, job=make_job(description=LONG_DESCRIPTION), on_duplicate="allow")
+    
+    assert job.stored_description == ""
+    assert len(job.description_z) < len(LONG_DESCRIPTION) // 10
+    db.expire_all()
+    assert crud.get_job(db=db, job_id=job.id).description == LONG_DESCRIPTION
+    assert search.search_job_ids(db, "logistics") == [job.id]
+    
+    crud.update_job(db=db, job_id=job.id, job_update=schemas.JobUpdate(description="Short text about robotics"))
+    db.expire_all()
+    job = crud.get_job(db=db, job_id=job.id)
+    assert (job.stored_description, job.description_z) == ("Short text about robotics", None)
+    assert search.search_job_ids(db, "logistics") == []
+    assert search.search_job_ids(db, "robotics") == [job.id]
+
+
+def test_compress_existing_descriptions(db: Session, make_job):
+    """Test that rows stored uncompressed are compressed in place without losing search hits."""
+    job = crud.create_job(db=db, job=make_job(description="Short"), on_duplicate="allow")
+    db.execute(text("UPDATE jobs SET description = :description WHERE id = :id"), {"description": LONG_DESCRIPTION, "id": job.id})
+    db.commit()
+    assert len(LONG_DESCRIPTION) >= compression.COMPRESSION_THRESHOLD
+    seq = crud.get_latest_change_seq(db=db)
+    
+    assert crud.compress_job_descriptions(db=db) == 1
+    assert crud.compress_job_descriptions(db=db) == 0
+    
+    db.expire_all()
+    job = crud.get_job(db=db, job_id=job.id)
+    assert job.stored_description == "" and job.description == LONG_DESCRIPTION
+    assert search.search_job_ids(db, "ingestion") == [job.id]
+    assert crud.get_latest_change_seq(db=db) == seq  # Content did not change
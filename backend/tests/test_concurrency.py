@@ -0,0 +1,108 @@
+"""Unit tests for request coalescing and admission control."""
+import threading
+import time
+import pytest
+from app.concurrency import AdmissionController, Overloaded, SingleFlight
+
+
+def test_single_flight_shares_one_computation():
+    """Test that concurrent callers with the same key run the function once."""
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ["result"]
+    
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", compute)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [
+        threading.Thread(target=lambda: results.append(flights.do("key", compute)))
+        for _ in range(3)
+    ]
+    for follower in followers:
+        follower.start()
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(timeout=5)
+    
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert all(result is results[0] for result in results)
+    
+    # Finished flights are not cached
+    assert flights.do("key", lambda: "fresh") == "fresh"
+
+
+def test_single_flight_propagates_errors():
+    """Test that an exception reaches the caller and clears the flight."""
+    flights = SingleFlight()
+    
+    with pytest.raises(ValueError):
+        flights.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flights.do("key", lambda: 42) == 42
+
+
+def test_admission_sheds_when_queue_is_full():
+    """Test that requests beyond the concurrency limit and queue are rejected."""
+    admission = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=1, retry_after=3)
+    
+    with admission.admit():
+        with pytest.raises(Overloaded) as excinfo:
+            with admission.admit():
+                pass
+    assert excinfo.value.retry_after == 3
+    
+    # The slot is released afterwards
+    with admission.admit():
+        pass
+
+
+def test_admission_queue_times_out():
+    """Test that queued requests give up after the queue timeout."""
+    admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    
+    with admission.admit():
+        with pytest.raises(Overloaded):
+            with admission.admit():
+                pass
+
+
+def test_single_flight_followers_take_queue_places():
+    """Test that callers waiting on a shared computation are shed once the queue is full."""
+    flights = SingleFlight()
+    admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1, retry_after=2)
+    started = threading.Event()
+    release = threading.Event()
+    
+    def compute():
+        with admission.admit():
+            started.set()
+            release.wait(timeout=5)
+            return "result"
+    
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", compute, follow=admission.queued)))
+    leader.start()
+    started.wait(timeout=5)
+    follower = threading.Thread(target=lambda: results.append(flights.do("key", compute, follow=admission.queued)))
+    follower.start()
+    deadline = time.monotonic() + 5
+    while admission._waiting < 1 and time.monotonic() < deadline:
+        time.sleep(0.001)  # Until the follower is waiting
+    
+    with pytest.raises(Overloaded) as excinfo:
+        flights.do("key", compute, follow=admission.queued)
+    assert excinfo.value.retry_after == 2
+    
+    release.set()
+    for thread in (leader, follower):
+        thread.join(timeout=5)
+    assert results == ["result", "result"]
+    assert admission._waiting == 0
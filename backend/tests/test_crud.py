@@ -1,20 +1,9 @@
 """Unit tests for CRUD operations."""
 import pytest
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from app import crud, schemas, models
-from app.database import Base, engine, SessionLocal
-
-
-@pytest.fixture
-def db():
-    """Create a test database session."""
-    Base.metadata.create_all(bind=engine)
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
+from app import crud, models, schemas
+from app.routers import candidates as candidates_router
 
 
 def test_create_job(db: Session):
@@ -185,3 +174,181 @@ def test_delete_candidate(db: Session):
     deleted_candidate = crud.get_candidate(db=db, candidate_id=created_candidate.id)
     assert deleted_candidate is None
 
+
+
+def test_job_writes_are_logged_in_order(db: Session):
+    """Test that each job mutation appends a change event."""
+    job_data = schemas.JobCreate(
+        title="Software Engineer",
+        description="Build amazing software",
+        required_skills=["Python"],
+        min_years_experience=2
+    )
+    created_job = crud.create_job(db=db, job=job_data)
+    crud.update_job(db=db, job_id=created_job.id, job_update=schemas.JobUpdate(title="Staff Engineer"))
+    crud.delete_job(db=db, job_id=created_job.id)
+    
+    changes = crud.get_changes(db=db, since=0)
+    
+    assert [c.op for c in changes] == ["create", "update", "delete"]
+    assert all(c.entity == "job" and c.entity_id == created_job.id for c in changes)
+    assert changes[1].get_payload()["title"] == "Staff Engineer"
+    assert changes[2].get_payload() is None
+    assert crud.get_latest_change_seq(db=db) == changes[-1].seq
+    assert crud.get_changes(db=db, since=changes[0].seq)[0].op == "update"
+
+
+def test_bulk_create_emits_single_batched_event(db: Session):
+    """Test that bulk job creation is logged as one compact event."""
+    jobs = crud.create_jobs(db=db, jobs=[
+        schemas.JobCreate(
+            title=f"Job {i}",
+            description="Description",
+            required_skills=["Python"],
+            min_years_experience=i
+        )
+        for i in range(3)
+    ])
+    
+    changes = crud.get_changes(db=db, since=0)
+    
+    assert len(jobs) == 3
+    assert len(changes) == 1
+    assert changes[0].op == "bulk_create"
+    assert changes[0].entity_id is None
+    assert changes[0].get_payload() == {"ids": [job.id for job in jobs]}
+    
+    # Empty batches log nothing, so change-feed consumers are not woken for no reason
+    assert crud.create_jobs(db=db, jobs=[]) == []
+    assert crud.create_candidates(db=db, candidates=[]) == []
+    assert crud.get_latest_change_seq(db=db) == changes[0].seq
+
+
+def test_get_jobs_for_matching_filters(db: Session, make_job):
+    """Test that match filters are applied before scoring."""
+    def job(title, skills, years):
+        return crud.create_job(db=db, job=make_job(title, skills, years), on_duplicate="allow")
+    
+    backend = job("Backend Engineer", ["Python", "Docker"], 2)
+    senior = job("Senior Backend Engineer", ["Python", "Docker", "AWS"], 6)
+    frontend = job("Frontend Engineer", ["JavaScript"], 1)
+    
+    def ids(**filters):
+        return [j.id for j in crud.get_jobs_for_matching(db=db, **filters)]
+    
+    assert ids(must_have=["Python", "Docker"]) == [backend.id, senior.id]
+    assert ids(must_have=["Python", "JavaScript"]) == []
+    assert ids(max_required_years=2) == [backend.id, frontend.id]
+    assert ids(title="senior") == [senior.id]
+    assert ids(must_have=["Docker"], max_required_years=5, title="backend") == [backend.id]
+    assert ids(q="engineer") == [backend.id, senior.id, frontend.id]
+    assert ids(title="senior back", q="engineer") == [senior.id]  # Both text filters apply
+    assert crud.count_jobs(db=db) == 3
+    
+    # Postings follow skill updates
+    crud.update_job(db=db, job_id=frontend.id, job_update=schemas.JobUpdate(required_skills=["Python", "Docker"]))
+    assert ids(must_have=["Docker"]) == [backend.id, senior.id, frontend.id]
+
+
+def test_skill_stats_follow_writes(db: Session):
+    """Test that skill counters are updated incrementally by every write."""
+    def stats(sort="demand"):
+        return {s.skill: (s.job_count, s.candidate_count, s.gap) for s in crud.get_skill_stats(db=db, sort=sort, limit=100)}
+    
+    job = crud.create_job(db=db, job=schemas.JobCreate(
+        title="Backend Engineer", description="Description",
+        required_skills=["Python", "Docker", "Python"], min_years_experience=2
+    ), on_duplicate="allow")
+    crud.create_jobs(db=db, jobs=[
+        schemas.JobCreate(title="Data Engineer", description="Description", required_skills=["Python", "SQL"], min_years_experience=1)
+    ], on_duplicate="allow")
+    candidate = crud.create_candidate(db=db, candidate=schemas.CandidateCreate(
+        name="Alice", skills=["Python", "React"], years_experience=3
+    ))
+    assert stats() == {"Python": (2, 1, 1), "Docker": (1, 0, 1), "SQL": (1, 0, 1)}
+    assert list(stats("supply")) == ["Python", "React"]
+    
+    crud.update_job(db=db, job_id=job.id, job_update=schemas.JobUpdate(required_skills=["Docker", "AWS"]))
+    crud.update_candidate(db=db, candidate_id=candidate.id, candidate_update=schemas.CandidateUpdate(skills=["SQL"]))
+    assert stats("gap") == {"AWS": (1, 0, 1), "Docker": (1, 0, 1), "Python": (1, 0, 1), "SQL": (1, 1, 0)}
+    
+    crud.delete_job(db=db, job_id=job.id)
+    crud.delete_candidate(db=db, candidate_id=candidate.id)
+    assert stats("gap") == {"Python": (1, 0, 1), "SQL": (1, 0, 1)}
+
+
+def test_upsert_jobs_skips_unchanged(db: Session):
+    """Test that upserts insert new, update changed and skip unchanged jobs."""
+    def item(external_id, title, years=2):
+        return schemas.JobUpsert(
+            external_id=external_id, title=title, description="Description",
+            required_skills=["Python"], min_years_experience=years
+        )
+    
+    first = crud.upsert_jobs(db=db, jobs=[item("a", "Backend Engineer"), item("b", "Data Engineer")])
+    assert (first["inserted"], first["updated"], first["unchanged"]) == (2, 0, 0)
+    seq = crud.get_latest_change_seq(db=db)
+    
+    second = crud.upsert_jobs(db=db, jobs=[item("a", "Backend Engineer"), item("b", "Data Engineer", years=4)])
+    assert (second["inserted"], second["updated"], second["unchanged"]) == (0, 1, 1)
+    assert second["ids"] == first["ids"]
+    assert [c.op for c in crud.get_changes(db=db, since=seq)] == ["update"]
+    assert crud.get_job(db=db, job_id=first["ids"][1]).min_years_experience == 4
+    
+    seq = crud.get_latest_change_seq(db=db)
+    third = crud.upsert_jobs(db=db, jobs=[item("a", "Backend Engineer"), item("b", "Data Engineer", years=4)])
+    assert (third["inserted"], third["updated"], third["unchanged"]) == (0, 0, 2)
+    assert crud.get_latest_change_seq(db=db) == seq  # Nothing logged, caches stay valid
+    assert crud.count_jobs(db=db) == 2
+
+
+def test_upsert_candidates_skips_unchanged(db: Session):
+    """Test that candidate upserts insert new, update changed and skip unchanged candidates."""
+    def item(external_id, name, years=3):
+        return schemas.CandidateUpsert(external_id=external_id, name=name, skills=["Python"], years_experience=years)
+    
+    first = crud.upsert_candidates(db=db, candidates=[item("a", "Alice"), item("b", "Bob")])
+    assert (first["inserted"], first["updated"], first["unchanged"]) == (2, 0, 0)
+    seq = crud.get_latest_change_seq(db=db)
+    
+    second = crud.upsert_candidates(db=db, candidates=[item("a", "Alice"), item("b", "Bob", years=5)])
+    assert (second["inserted"], second["updated"], second["unchanged"]) == (0, 1, 1)
+    assert second["ids"] == first["ids"]
+    assert [c.op for c in crud.get_changes(db=db, since=seq)] == ["update"]
+    assert crud.get_candidate(db=db, candidate_id=first["ids"][1]).years_experience == 5
+    
+    # A row written before content hashes existed is matched on its content, not re-logged
+    db.query(models.Candidate).update({models.Candidate.content_hash: None})
+    db.commit()
+    seq = crud.get_latest_change_seq(db=db)
+    third = crud.upsert_candidates(db=db, candidates=[item("a", "Alice"), item("b", "Bob", years=5)])
+    assert (third["inserted"], third["updated"], third["unchanged"]) == (0, 0, 2)
+    assert crud.get_latest_change_seq(db=db) == seq
+    assert all(c.content_hash for c in crud.get_candidates_by_ids(db=db, candidate_ids=first["ids"]))
+    assert db.query(models.Candidate).count() == 2
+
+
+def test_upsert_candidates_conflict_returns_409(db: Session, monkeypatch):
+    """Test that losing an insert race on external_id is reported as a retryable 409."""
+    item = schemas.CandidateUpsert(external_id="c1", name="Alice", skills=["Python"], years_experience=3)
+    crud.upsert_candidates(db=db, candidates=[item])
+    # Simulate a concurrent upsert inserting "c1" after this one looked up the stored rows
+    monkeypatch.setattr(crud, "_stored_hashes", lambda db, model, external_ids: {})
+    
+    with pytest.raises(HTTPException) as exc_info:
+        candidates_router.upsert_candidates(candidates=[item], db=db)
+    assert exc_info.value.status_code == 409
+    assert db.query(models.Candidate).count() == 1  # Session was rolled back and is still usable
+
+
+def test_upsert_candidates_keeps_alert_threshold(db: Session):
+    """Test that re-sending a feed item leaves a candidate's own alert threshold alone."""
+    item = schemas.CandidateUpsert(external_id="c1", name="Alice", skills=["Python"], years_experience=3)
+    ids = crud.upsert_candidates(db=db, candidates=[item])["ids"]
+    crud.update_candidate(db=db, candidate_id=ids[0], candidate_update=schemas.CandidateUpdate(alert_threshold=70))
+    seq = crud.get_latest_change_seq(db=db)
+    
+    result = crud.upsert_candidates(db=db, candidates=[item])
+    assert (result["updated"], result["unchanged"]) == (0, 1)
+    assert crud.get_latest_change_seq(db=db) == seq
+    assert crud.get_candidate(db=db, candidate_id=ids[0]).alert_threshold == 70
@@ -0,0 +1,47 @@
+"""Unit tests for change-log driven invalidation of in-process state."""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app import crud, schemas, similarity
+from app.database import SessionLocal, engine
+from app.invalidation import watcher
+
+
+def test_index_follows_writes_from_other_sessions(db: Session, make_job):
+    """Test that the similarity index catches up on writes it was not told about."""
+    probe = crud.create_job(db=db, job=make_job("Data Engineer", ["Python", "Spark", "SQL"]), on_duplicate="allow")
+    assert similarity.find_similar_jobs(probe, threshold=0.5) == []
+    
+    # Another worker writes to the shared database
+    other = SessionLocal()
+    try:
+        twin = crud.create_job(db=other, job=make_job("Data Engineer", ["Python", "Spark", "SQL"]), on_duplicate="allow")
+        twin_id = twin.id
+        bulk = crud.create_jobs(db=other, jobs=[make_job("Data Engineer", ["Python", "Spark", "Kafka"])], on_duplicate="allow")
+        bulk_id = bulk[0].id
+    finally:
+        other.close()
+    
+    assert [job_id for job_id, _ in similarity.find_similar_jobs(probe, threshold=0.5)] == [twin_id, bulk_id]
+    assert watcher.seq == crud.get_latest_change_seq(db=db)
+    db.commit()
+    assert engine.pool.checkedout() == 0  # The data_version probe uses its own connection
+    
+    crud.update_job(db=db, job_id=twin_id, job_update=schemas.JobUpdate(title="Designer", required_skills=["Figma"]))
+    crud.delete_job(db=db, job_id=bulk_id)
+    assert similarity.find_similar_jobs(probe, threshold=0.5) == []
+
+
+def test_index_resets_when_change_log_is_replaced(db: Session, make_job):
+    """Test that a change log that no longer contains the last applied event resets the index."""
+    probe = crud.create_job(db=db, job=make_job("QA Engineer", ["Selenium", "Python"]), on_duplicate="allow")
+    similarity.find_similar_jobs(probe, threshold=0.5)
+    
+    # Simulate the database being rebuilt underneath the worker
+    db.execute(text("DELETE FROM changes"))
+    db.execute(text("DELETE FROM sqlite_sequence WHERE name = 'changes'"))
+    db.commit()
+    twin = crud.create_job(db=db, job=make_job("QA Engineer", ["Selenium", "Python"]), on_duplicate="allow")
+    
+    similarity.find_similar_jobs(probe, threshold=0.5)  # Notices the reset and rebuilds in the background
+    assert similarity.wait_for_job_index(timeout=5) is not None
+    assert [job_id for job_id, _ in similarity.find_similar_jobs(probe, threshold=0.5)] == [twin.id]
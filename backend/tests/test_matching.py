@@ -1,7 +1,11 @@
 """Unit tests for match algorithm."""
+import time
 import pytest
+from app import crud, schemas
 from app.models import Job, Candidate
-from app.matching import calculate_match_score, get_job_matches
+from app.matching import (
+    CatalogueScorer, calculate_match_score, get_job_matches, get_job_matches_until, summarize_scores
+)
 
 
 def test_perfect_match():
@@ -128,3 +132,93 @@ def test_get_job_matches_sorting():
     assert matches[0]["matchScore"] >= matches[1]["matchScore"]
     assert matches[1]["matchScore"] >= matches[2]["matchScore"]
 
+
+
+def test_get_job_matches_top_k():
+    """Test that top_k returns the same leading matches as a full sort."""
+    candidate = Candidate()
+    candidate.set_skills_list(["Python", "Docker"])
+    candidate.years_experience = 3
+    
+    jobs = []
+    for i, skills in enumerate([["Python"], ["Java"], ["Python", "Docker"], ["Docker"], ["Go"]], 1):
+        job = Job()
+        job.id = i
+        job.title = f"Job {i}"
+        job.set_skills_list(skills)
+        job.min_years_experience = 2
+        jobs.append(job)
+    
+    full = get_job_matches(candidate, jobs)
+    top = get_job_matches(candidate, jobs, top_k=3)
+    
+    # Ties keep catalogue order in both paths
+    assert [m["jobId"] for m in top] == [m["jobId"] for m in full[:3]]
+    assert [m["jobId"] for m in full] == [1, 3, 4, 2, 5]
+
+
+def test_get_job_matches_until_deadline(db):
+    """Test that approximate matching scores high-overlap jobs first and reports exactness."""
+    for i, skills in enumerate([["Go"], ["Python"], ["Java"], ["Python", "Docker"], ["Docker", "AWS"]], 1):
+        crud.create_job(db=db, job=schemas.JobCreate(
+            title=f"Job {i}", description="Description", required_skills=skills, min_years_experience=2
+        ), on_duplicate="allow")
+    candidate = crud.create_candidate(db=db, candidate=schemas.CandidateCreate(
+        name="Alice", skills=["Python", "Docker"], years_experience=3
+    ))
+    exact = get_job_matches(candidate, crud.get_all_jobs(db=db, limit=None), top_k=3)
+    
+    def batches():
+        return crud.iter_jobs_by_skill_overlap(db=db, skills=candidate.get_skills_list(), batch_size=1)
+    
+    assert [overlap for overlap, _ in batches()] == [2, 1, 1, 0, 0]
+    
+    # Out of time after the first batch: only the best-overlap job is scored
+    matches, examined, is_exact = get_job_matches_until(candidate, batches(), time.monotonic() - 1, top_k=3)
+    assert ([m["jobId"] for m in matches], examined, is_exact) == ([4], 1, False)
+    
+    # Jobs sharing no skill cannot beat the top 3, so they are never scored
+    matches, examined, is_exact = get_job_matches_until(candidate, batches(), time.monotonic() + 60, top_k=3)
+    assert (matches, examined, is_exact) == (exact, 3, True)
+
+
+def test_summary_counts_match_exhaustive_scores(db):
+    """Test that the grouped score summary agrees with scoring every job."""
+    for i, (skills, years) in enumerate([
+        (["Go"], 1), (["Python"], 5), (["Python", "Docker"], 2), (["Docker", "AWS"], 2), ([], 0), (["Python"], 5)
+    ], 1):
+        crud.create_job(db=db, job=schemas.JobCreate(
+            title=f"Job {i}", description="Description", required_skills=skills, min_years_experience=years
+        ), on_duplicate="allow")
+    candidate = crud.create_candidate(db=db, candidate=schemas.CandidateCreate(
+        name="Alice", skills=["Python", "Docker"], years_experience=3
+    ))
+    scores = [m["matchScore"] for m in get_job_matches(candidate, crud.get_all_jobs(db=db, limit=None))]
+    
+    groups = crud.count_jobs_by_score_inputs(db=db, skills=candidate.get_skills_list())
+    histogram, at_or_above = summarize_scores(groups, candidate.years_experience, bucket_size=25, thresholds=[70, 30])
+    
+    assert len(groups) == 5  # The two identical Python jobs share a group
+    assert histogram == [sum(s < 25 for s in scores), sum(25 <= s < 50 for s in scores),
+                         sum(50 <= s < 75 for s in scores), sum(s >= 75 for s in scores)]
+    assert at_or_above == {30: sum(s >= 30 for s in scores), 70: sum(s >= 70 for s in scores)}
+
+
+def test_catalogue_scorer_matches_calculate_match_score():
+    """Test that the batched export scorer agrees with scoring each pair, with and without a floor."""
+    jobs = []
+    for i, (skills, years) in enumerate([
+        (["Go"], 1), (["Python", "Python"], 5), (["Python", "Docker"], 2), (["Docker", "AWS"], 0), ([], 3)
+    ], 1):
+        job = Job(id=i, min_years_experience=years)
+        job.set_skills_list(skills)
+        jobs.append(job)
+    scorer = CatalogueScorer((job.id, job.get_skills_list(), job.min_years_experience) for job in jobs)
+    
+    for skills, years in [(["Python", "Docker"], 3), (["Go", "AWS"], 0), ([], 8)]:
+        candidate = Candidate(years_experience=years)
+        candidate.set_skills_list(skills)
+        expected = [(job.id, calculate_match_score(candidate, job)) for job in jobs]
+        assert list(scorer.score(skills, years)) == expected
+        # Above 30 only jobs sharing a skill are visited
+        assert list(scorer.score(skills, years, min_score=50)) == [(i, s) for i, s in expected if s >= 50]
@@ -0,0 +1,37 @@
+"""Unit tests for full-text job search."""
+from sqlalchemy.orm import Session
+from app import crud, schemas, search
+
+
+def test_search_ranks_title_hits_first(db: Session, make_job):
+    """Test BM25 ranking with title matches weighted above descriptions."""
+    in_description = crud.create_job(db=db, job=make_job("Engineer", description="Work on our data platform"), on_duplicate="allow")
+    in_title = crud.create_job(db=db, job=make_job("Data Engineer", description="Build pipelines"), on_duplicate="allow")
+    crud.create_job(db=db, job=make_job("Designer", description="Draw things"), on_duplicate="allow")
+    
+    total, hits = search.search_jobs(db, "data")
+    
+    assert total == 2
+    assert [job_id for job_id, _ in hits] == [in_title.id, in_description.id]
+    assert hits[0][1] > hits[1][1]
+
+
+def test_search_follows_updates_and_deletes(db: Session, make_job):
+    """Test that the index stays in sync with job writes."""
+    job = crud.create_job(db=db, job=make_job("Backend Developer", description="APIs"))
+    crud.update_job(db=db, job_id=job.id, job_update=schemas.JobUpdate(title="Platform Developer"))
+    
+    assert search.search_job_ids(db, "backend") == []
+    assert search.search_job_ids(db, "platform") == [job.id]
+    
+    crud.delete_job(db=db, job_id=job.id)
+    assert search.search_job_ids(db, "platform") == []
+
+
+def test_search_query_is_sanitized(db: Session, make_job):
+    """Test that FTS syntax in user input is treated as text, with prefix matching."""
+    job = crud.create_job(db=db, job=make_job("Kubernetes Admin", description="Run clusters"))
+    
+    assert search.to_match_query('kube "AND" -') == '"kube" "AND"*'
+    assert search.search_job_ids(db, "kube") == [job.id]
+    assert search.search_job_ids(db, "!!!") == []
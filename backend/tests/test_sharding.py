@@ -0,0 +1,65 @@
+"""Unit tests for sharded scatter-gather matching."""
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy.orm import Session
+from app import crud, matching, schemas
+from app.sharding import ShardedMatcher
+
+
+@pytest.fixture
+def matcher():
+    """Start a two-shard matcher against the test database."""
+    sharded = ShardedMatcher(num_shards=2, num_channels=3)
+    yield sharded
+    sharded.close()
+
+
+def test_sharded_matches_equal_sequential(db: Session, matcher: ShardedMatcher, make_job):
+    """Test that sharded results, including tie order and top-K, match get_job_matches."""
+    skill_sets = [["Python"], ["Python", "Docker"], ["Java"], ["Docker"], ["Python", "Go"], ["Docker", "AWS"]]
+    crud.create_jobs(db=db, jobs=[
+        make_job(f"Job {i}", skill_sets[i % len(skill_sets)], i % 4) for i in range(30)
+    ], on_duplicate="allow")
+    candidate = crud.create_candidate(db=db, candidate=schemas.CandidateCreate(
+        name="John Doe",
+        skills=["Python", "Docker"],
+        years_experience=2
+    ))
+    matcher.start()
+    
+    def sequential(top_k=None):
+        return matching.get_job_matches(candidate, crud.get_all_jobs(db=db, limit=None), top_k=top_k)
+    
+    size, matches = matcher.match(candidate, crud.get_latest_change_seq(db=db))
+    assert size == 30
+    assert matches == sequential()
+    assert matcher.match(candidate, crud.get_latest_change_seq(db=db), top_k=7)[1] == sequential(top_k=7)
+    
+    # Shards catch up on writes made after they loaded
+    jobs = crud.get_all_jobs(db=db, limit=None)
+    crud.update_job(db=db, job_id=jobs[0].id, job_update=schemas.JobUpdate(required_skills=["Python", "Docker"]))
+    crud.delete_job(db=db, job_id=jobs[1].id)
+    crud.create_job(db=db, job=make_job("New", ["Docker"], 0), on_duplicate="allow")
+    crud.create_jobs(db=db, jobs=[make_job("Bulk", ["Python"], 1)], on_duplicate="allow")
+    
+    size, matches = matcher.match(candidate, crud.get_latest_change_seq(db=db))
+    assert size == 31
+    assert matches == sequential()
+
+
+def test_concurrent_requests_share_the_workers(db: Session, matcher: ShardedMatcher, make_job):
+    """Test that several scatter-gathers in flight at once each get their own results."""
+    crud.create_jobs(db=db, jobs=[
+        make_job(f"Job {i}", [["Python"], ["Docker"], ["Go", "Python"]][i % 3], i % 3) for i in range(20)
+    ], on_duplicate="allow")
+    candidates = [
+        crud.create_candidate(db=db, candidate=schemas.CandidateCreate(name=f"C{i}", skills=skills, years_experience=i))
+        for i, skills in enumerate([["Python"], ["Docker"], ["Go"], ["Python", "Docker"], []] * 4)
+    ]
+    matcher.start()
+    seq = crud.get_latest_change_seq(db=db)
+    jobs = crud.get_all_jobs(db=db, limit=None)
+    
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(lambda candidate: matcher.match(candidate, seq, top_k=5)[1], candidates))
+    assert results == [matching.get_job_matches(candidate, jobs, top_k=5) for candidate in candidates]
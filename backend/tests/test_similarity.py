@@ -0,0 +1,88 @@
+"""Unit tests for the MinHash/LSH similarity index."""
+import threading
+from sqlalchemy.orm import Session
+from app import crud, similarity
+from app.similarity import MinHashLSH, jaccard, job_tokens
+
+
+def test_lsh_finds_near_duplicates_only():
+    """Test that LSH lookups return similar sets and skip unrelated ones."""
+    index = MinHashLSH()
+    base = job_tokens("Backend Engineer", ["Python", "FastAPI", "Docker", "AWS", "PostgreSQL"])
+    variant = job_tokens("Backend Engineer", ["Python", "FastAPI", "Docker", "AWS", "Redis"])
+    unrelated = job_tokens("Frontend Developer", ["JavaScript", "React", "CSS"])
+    index.add(1, variant)
+    index.add(2, unrelated)
+    
+    results = index.query(base, threshold=0.5)
+    
+    assert [key for key, _ in results] == [1]
+    assert results[0][1] == jaccard(base, variant)
+    
+    index.remove(1)
+    assert index.query(base, threshold=0.5) == []
+
+
+def test_job_tokens_are_case_insensitive():
+    """Test that skill and title tokens ignore case."""
+    assert job_tokens("Senior Dev", ["Python"]) == job_tokens("senior dev", ["python"])
+    assert job_tokens("Senior Dev", ["Python"], include_title=False) == frozenset({"s:python"})
+
+
+def test_create_job_flags_and_merges_duplicates(db: Session, make_job):
+    """Test near-duplicate handling at ingest."""
+    original = crud.create_job(db=db, job=make_job("Data Engineer", ["Python", "Spark", "SQL"]))
+    
+    flagged = crud.create_job(db=db, job=make_job("Data Engineer", ["python", "Spark", "SQL"]), on_duplicate="flag")
+    merged = crud.create_job(db=db, job=make_job("Data Engineer", ["Python", "Spark", "SQL"]), on_duplicate="merge")
+    other = crud.create_job(db=db, job=make_job("Designer", ["Figma"]), on_duplicate="flag")
+    
+    assert original.duplicate_of is None
+    assert flagged.duplicate_of == original.id
+    assert merged.id == original.id
+    assert other.duplicate_of is None
+    assert len(crud.get_all_jobs(db=db)) == 3
+
+
+def test_bulk_create_detects_duplicates_within_batch(db: Session, make_job):
+    """Test that duplicates inside one bulk request are flagged or merged."""
+    flagged = crud.create_jobs(db=db, jobs=[
+        make_job("QA Engineer", ["Selenium", "Python"]),
+        make_job("QA Engineer", ["Selenium", "Python"]),
+    ], on_duplicate="flag")
+    merged = crud.create_jobs(db=db, jobs=[
+        make_job("SRE", ["Linux", "Go"]),
+        make_job("SRE", ["Linux", "Go"]),
+    ], on_duplicate="merge")
+    
+    assert flagged[1].duplicate_of == flagged[0].id
+    assert merged[0].id == merged[1].id
+    assert len(crud.get_all_jobs(db=db)) == 3
+
+
+def test_writes_do_not_wait_for_the_index_build(db: Session, make_job, monkeypatch):
+    """Test that the index builds in the background while writes skip the duplicate check."""
+    original = crud.create_job(db=db, job=make_job("Data Engineer", ["Python", "Spark", "SQL"]))
+    building = threading.Event()
+    release = threading.Event()
+    add_rows = similarity._add_rows
+    
+    def slow_add_rows(index, rows):
+        building.set()
+        release.wait(timeout=5)
+        add_rows(index, rows)
+    
+    monkeypatch.setattr(similarity, "_add_rows", slow_add_rows)
+    similarity.reset_job_index()
+    similarity.start_job_index()
+    assert building.wait(timeout=5)
+    
+    during = crud.create_job(db=db, job=make_job("Data Engineer", ["Python", "Spark", "SQL"]), on_duplicate="flag")
+    assert during.duplicate_of is None  # Not checked rather than blocked
+    assert similarity.find_similar_jobs(original, threshold=0.5) is None
+    
+    release.set()
+    assert similarity.wait_for_job_index(timeout=5) is not None
+    assert [job_id for job_id, _ in similarity.find_similar_jobs(original, threshold=0.5)] == [during.id]
+    after = crud.create_job(db=db, job=make_job("Data Engineer", ["Python", "Spark", "SQL"]), on_duplicate="flag")
+    assert after.duplicate_of == original.id
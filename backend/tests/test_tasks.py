@@ -0,0 +1,151 @@
+"""Unit tests for the background task queue."""
+from datetime import datetime
+import pytest
+from app import crud, models, schemas, tasks
+
+
+def test_import_task_runs_and_reports_progress(db):
+    """Test that a queued import task creates the rows and records its result."""
+    task = tasks.enqueue(db, "import", {
+        "jobs": [
+            {"title": "Python Dev", "description": "Build APIs", "required_skills": ["Python"], "min_years_experience": 2},
+            {"title": "Frontend Dev", "description": "Build UIs", "required_skills": ["React"], "min_years_experience": 1},
+        ],
+        "candidates": [{"name": "Alice", "skills": ["Python"], "years_experience": 3}],
+        "batch_size": 1
+    })
+    assert task.status == "queued"
+
+    assert tasks.run_next() is True
+    assert tasks.run_next() is False  # Queue drained
+
+    db.expire_all()
+    task = tasks.get_task(db, task.id)
+    assert task.status == "succeeded"
+    assert task.attempts == 1
+    assert (task.progress, task.total) == (3, 3)
+    result = task.get_result()
+    assert len(result["job_ids"]) == 2 and len(result["candidate_ids"]) == 1
+    assert crud.count_jobs(db) == 2
+
+
+def test_retried_import_resumes_after_committed_batches(db, monkeypatch):
+    """Test that a retry after a mid-import failure does not insert committed batches again."""
+    create_candidates = crud.create_candidates
+    failures = [RuntimeError("database is locked")]
+
+    def flaky_create_candidates(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return create_candidates(*args, **kwargs)
+
+    monkeypatch.setattr(crud, "create_candidates", flaky_create_candidates)
+    task = tasks.enqueue(db, "import", {
+        "jobs": [
+            {"title": "Python Dev", "description": "Build APIs", "required_skills": ["Python"], "min_years_experience": 2},
+            {"title": "Frontend Dev", "description": "Build UIs", "required_skills": ["React"], "min_years_experience": 1},
+        ],
+        "candidates": [{"name": "Alice", "skills": ["Python"], "years_experience": 3}],
+        "batch_size": 1
+    })
+
+    assert tasks.run_next() is True  # Both job batches commit, then the candidate batch fails
+    db.expire_all()
+    task = tasks.get_task(db, task.id)
+    assert task.status == "queued"
+    task.run_after = datetime.utcnow()
+    db.commit()
+
+    assert tasks.run_next() is True
+    db.expire_all()
+    task = tasks.get_task(db, task.id)
+    assert (task.status, task.attempts) == ("succeeded", 2)
+    result = task.get_result()
+    assert len(result["job_ids"]) == 2 and len(result["candidate_ids"]) == 1
+    assert crud.count_jobs(db) == 2
+    assert all(job.duplicate_of is None for job in crud.get_all_jobs(db))
+
+
+def test_failed_task_is_retried_then_marked_failed(db):
+    """Test that failures back off and retry until max_attempts is exhausted."""
+    calls = []
+
+    @tasks.task_handler("test_always_fails")
+    def always_fails(db, params, ctx):
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    task = tasks.enqueue(db, "test_always_fails", max_attempts=2)
+
+    assert tasks.run_next() is True
+    db.expire_all()
+    task = tasks.get_task(db, task.id)
+    assert task.status == "queued"
+    assert task.run_after > datetime.utcnow()  # Backing off
+    assert tasks.run_next() is False
+
+    task.run_after = datetime.utcnow()
+    db.commit()
+    assert tasks.run_next() is True
+    db.expire_all()
+    task = tasks.get_task(db, task.id)
+    assert task.status == "failed"
+    assert task.attempts == 2
+    assert "boom" in task.error
+    assert len(calls) == 2
+
+
+def test_enqueue_rejects_unknown_kind(db):
+    """Test that only registered task kinds can be queued."""
+    with pytest.raises(ValueError):
+        tasks.enqueue(db, "no_such_task")
+
+
+def test_new_job_percolates_to_alerted_candidates(db):
+    """Test that creating a job queues a task that notifies candidates whose threshold it meets."""
+    crud.create_candidate(db, schemas.CandidateCreate(name="No alerts", skills=["Python"], years_experience=5))
+    match = crud.create_candidate(db, schemas.CandidateCreate(
+        name="Match", skills=["Python", "SQL"], years_experience=5, alert_threshold=80
+    ))
+    crud.create_candidate(db, schemas.CandidateCreate(
+        name="Too picky", skills=["Python"], years_experience=5, alert_threshold=80
+    ))
+    experienced = crud.create_candidate(db, schemas.CandidateCreate(
+        name="Experienced", skills=["Go"], years_experience=4, alert_threshold=25
+    ))
+
+    job = crud.create_job(db, schemas.JobCreate(
+        title="Backend", description="APIs", required_skills=["Python", "SQL"], min_years_experience=4
+    ))
+    assert crud.get_notifications(db, match.id) == []  # Percolated after the commit, by a worker
+
+    assert tasks.run_next() is True
+    assert tasks.run_next() is False
+    alerts = {n.candidate_id: (n.job_id, n.match_score) for n in db.query(models.Notification)}
+    assert alerts == {match.id: (job.id, 100), experienced.id: (job.id, 30)}
+
+    tasks.run_task(tasks.enqueue(db, "percolate_jobs", {"job_ids": [job.id]}).id)  # Replays add nothing
+    assert db.query(models.Notification).count() == 2
+
+
+def test_recompute_matches_stores_rows_not_result(db):
+    """Test that recomputed matches go to task_matches and the result only holds counts."""
+    python_dev, go_dev = crud.create_jobs(db, [
+        schemas.JobCreate(title="Python Dev", description="APIs", required_skills=["Python"], min_years_experience=1),
+        schemas.JobCreate(title="Go Dev", description="Services", required_skills=["Go"], min_years_experience=1),
+    ], on_duplicate="allow")
+    alice, bob = crud.create_candidates(db, [
+        schemas.CandidateCreate(name="Alice", skills=["Python"], years_experience=3),
+        schemas.CandidateCreate(name="Bob", skills=["Go"], years_experience=3),
+    ])
+    task = tasks.enqueue(db, "recompute_matches", {"top_k": 1})
+    
+    assert tasks.run_next() is True
+    db.expire_all()
+    task = tasks.get_task(db, task.id)
+    assert task.status == "succeeded"
+    assert task.get_result() == {"candidates": 2, "matches": 2}
+    
+    matches = tasks.get_task_matches(db, task.id)
+    assert [(m.candidate_id, m.rank, m.job_id) for m in matches] == [(alice.id, 0, python_dev.id), (bob.id, 0, go_dev.id)]
+    assert [m.job_id for m in tasks.get_task_matches(db, task.id, candidate_id=bob.id)] == [go_dev.id]
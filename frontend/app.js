@@ -78,73 +78,273 @@ function getMatchScoreClass(score) {
     return 'low';
 }
 
-// Fetch job matches from API
-async function fetchJobMatches(candidateId) {
+// Virtualized table settings: rows have a fixed height, so the visible
+// window can be computed from the scroll position alone
+const PAGE_SIZE = 100;
+const ROW_HEIGHT = 64;
+const OVERSCAN_ROWS = 10;
+
+// Read a cached page of matches from sessionStorage
+function getCachedPage(cacheKey) {
     try {
-        showLoading();
-        hideError('errorMessage');
-        
-        const response = await fetch(`${API_BASE_URL}/candidates/${candidateId}/matches`);
-        
-        if (!response.ok) {
-            if (response.status === 404) {
-                throw new Error('Candidate not found. Please check your candidate ID.');
-            }
-            throw new Error(`Failed to fetch matches: ${response.statusText}`);
-        }
-        
-        const matches = await response.json();
-        return matches;
+        return JSON.parse(sessionStorage.getItem(cacheKey));
     } catch (error) {
-        throw error;
-    } finally {
-        hideLoading();
+        return null;
     }
 }
 
-// Render jobs table
-function renderJobsTable(matches) {
-    const tableBody = document.getElementById('jobsTableBody');
+// Write a page of matches to sessionStorage (best effort)
+function setCachedPage(cacheKey, page) {
+    try {
+        sessionStorage.setItem(cacheKey, JSON.stringify(page));
+    } catch (error) {
+        // Storage full or unavailable: the page is simply not cached
+    }
+}
+
+// Fetch a page of job matches from API, revalidating any cached copy
+async function fetchJobMatches(candidateId, skip = 0, limit = PAGE_SIZE) {
+    const cacheKey = `matches:${candidateId}:${skip}:${limit}`;
+    const cached = getCachedPage(cacheKey);
+    const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+    
+    const response = await fetch(
+        `${API_BASE_URL}/candidates/${candidateId}/matches?skip=${skip}&limit=${limit}`,
+        { headers, cache: 'no-store' }
+    );
+    
+    if (response.status === 304 && cached) {
+        return cached;
+    }
+    
+    if (!response.ok) {
+        if (response.status === 404) {
+            throw new Error('Candidate not found. Please check your candidate ID.');
+        }
+        throw new Error(`Failed to fetch matches: ${response.statusText}`);
+    }
+    
+    const page = {
+        matches: await response.json(),
+        total: parseInt(response.headers.get('X-Total-Count'), 10) || 0,
+        // Change position the matches reflect; live updates resume from here
+        changeSeq: response.headers.get('X-Change-Seq'),
+        etag: response.headers.get('ETag'),
+    };
+    if (page.etag) {
+        setCachedPage(cacheKey, page);
+    }
+    return page;
+}
+
+// Virtualized view state: `matches` is sparse, holes are pages not yet loaded
+const matchesView = {
+    candidateId: null,
+    matches: [],
+    etag: null,
+    pages: new Map(),  // page index -> pending request, or true once loaded
+};
+
+// Order matches like the API: score descending, then job ID ascending
+function compareMatches(a, b) {
+    return (b.matchScore - a.matchScore) || (a.jobId - b.jobId);
+}
+
+// Build a table row for a job match
+function createJobRow(match) {
+    const row = document.createElement('tr');
+    row.className = 'job-row';
+    
+    const scoreClass = getMatchScoreClass(match.matchScore);
+    const skillsHtml = formatSkills(match.requiredSkills);
+    
+    row.innerHTML = `
+        <td><strong>${escapeHtml(match.title)}</strong></td>
+        <td><div class="skills-list">${skillsHtml}</div></td>
+        <td>${match.minYearsExperience} years</td>
+        <td><span class="match-score ${scoreClass}">${match.matchScore}%</span></td>
+    `;
+    
+    return row;
+}
+
+// Build a row shown while its page is being fetched
+function createPlaceholderRow() {
+    const row = document.createElement('tr');
+    row.className = 'job-row placeholder-row';
+    row.innerHTML = '<td colspan="4">Loading...</td>';
+    return row;
+}
+
+// Build an empty row standing in for rows outside the visible window
+function createSpacerRow(height) {
+    const row = document.createElement('tr');
+    row.className = 'spacer-row';
+    row.innerHTML = `<td colspan="4" style="height: ${height}px"></td>`;
+    return row;
+}
+
+// Show the table or the "no jobs" message depending on the match count
+function updateTableVisibility() {
     const tableContainer = document.getElementById('jobsTableContainer');
     const noJobsMessage = document.getElementById('noJobsMessage');
+    const hasMatches = matchesView.matches.length > 0;
     
-    if (!tableBody || !tableContainer) return;
+    if (tableContainer) {
+        tableContainer.style.display = hasMatches ? 'block' : 'none';
+    }
+    if (noJobsMessage) {
+        noJobsMessage.style.display = hasMatches ? 'none' : 'block';
+    }
+}
+
+// Store a fetched page; a page from a newer catalogue version discards the rest
+function storePage(pageIndex, page) {
+    if (page.etag !== matchesView.etag) {
+        matchesView.matches = new Array(page.total);
+        matchesView.pages = new Map();
+        matchesView.etag = page.etag;
+    }
+    matchesView.matches.length = page.total;
+    page.matches.forEach((match, i) => {
+        matchesView.matches[pageIndex * PAGE_SIZE + i] = match;
+    });
+    matchesView.pages.set(pageIndex, true);
+}
+
+// Fetch a page in the background unless it is loaded or already requested
+function loadPage(pageIndex) {
+    if (matchesView.pages.has(pageIndex)) return;
     
-    // Clear existing rows
-    tableBody.innerHTML = '';
+    const candidateId = matchesView.candidateId;
+    const request = fetchJobMatches(candidateId, pageIndex * PAGE_SIZE, PAGE_SIZE)
+        .then(page => {
+            if (candidateId !== matchesView.candidateId) return;
+            storePage(pageIndex, page);
+            renderVisibleRows();
+        })
+        .catch(error => {
+            matchesView.pages.delete(pageIndex);
+            showError('errorMessage', error.message || 'An error occurred while fetching job matches.');
+        });
+    matchesView.pages.set(pageIndex, request);
+}
+
+// Index range of rows currently in (or near) the viewport
+function getVisibleRange() {
+    const scroller = document.getElementById('jobsScroll');
+    const total = matchesView.matches.length;
+    const scrollTop = scroller ? scroller.scrollTop : 0;
+    const viewportHeight = scroller ? scroller.clientHeight : 0;
     
-    if (!matches || matches.length === 0) {
-        tableContainer.style.display = 'none';
-        if (noJobsMessage) {
-            noJobsMessage.style.display = 'block';
+    const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+    const last = Math.min(total, Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN_ROWS);
+    return { first, last };
+}
+
+// Render only the rows in the visible window, padded by spacer rows
+function renderVisibleRows() {
+    const tableBody = document.getElementById('jobsTableBody');
+    if (!tableBody) return;
+    
+    updateTableVisibility();
+    
+    const total = matchesView.matches.length;
+    const { first, last } = getVisibleRange();
+    
+    const fragment = document.createDocumentFragment();
+    fragment.appendChild(createSpacerRow(first * ROW_HEIGHT));
+    for (let i = first; i < last; i++) {
+        const match = matchesView.matches[i];
+        if (match) {
+            fragment.appendChild(createJobRow(match));
+        } else {
+            fragment.appendChild(createPlaceholderRow());
+            loadPage(Math.floor(i / PAGE_SIZE));
         }
+    }
+    fragment.appendChild(createSpacerRow((total - last) * ROW_HEIGHT));
+    
+    tableBody.replaceChildren(fragment);
+}
+
+// Render jobs table from its first page of matches
+function renderJobsTable(firstPage) {
+    matchesView.etag = null;
+    storePage(0, firstPage);
+    renderVisibleRows();
+}
+
+// Refetch the visible pages; cached copies are revalidated, others dropped
+function refreshVisibleMatches() {
+    const { first, last } = getVisibleRange();
+    matchesView.pages = new Map();
+    for (let page = Math.floor(first / PAGE_SIZE); page <= Math.floor(Math.max(first, last - 1) / PAGE_SIZE); page++) {
+        loadPage(page);
+    }
+}
+
+// True when every page of matches has been loaded
+function hasAllMatches() {
+    const pageCount = Math.ceil(matchesView.matches.length / PAGE_SIZE);
+    for (let page = 0; page < pageCount; page++) {
+        if (matchesView.pages.get(page) !== true) return false;
+    }
+    return true;
+}
+
+// Apply a live delta; patched locally when fully loaded, otherwise refetched
+function applyMatchDelta(jobId, match) {
+    if (!hasAllMatches()) {
+        refreshVisibleMatches();
         return;
     }
     
-    // Hide no jobs message
-    if (noJobsMessage) {
-        noJobsMessage.style.display = 'none';
-    }
-    
-    // Show table
-    tableContainer.style.display = 'block';
-    
-    // Add rows for each job match
-    matches.forEach(match => {
-        const row = document.createElement('tr');
-        
-        const scoreClass = getMatchScoreClass(match.matchScore);
-        const skillsHtml = formatSkills(match.requiredSkills);
-        
-        row.innerHTML = `
-            <td><strong>${escapeHtml(match.title)}</strong></td>
-            <td><div class="skills-list">${skillsHtml}</div></td>
-            <td>${match.minYearsExperience} years</td>
-            <td><span class="match-score ${scoreClass}">${match.matchScore}%</span></td>
-        `;
-        
-        tableBody.appendChild(row);
+    const matches = matchesView.matches.filter(existing => existing.jobId !== jobId);
+    if (match) {
+        let index = matches.findIndex(existing => compareMatches(match, existing) < 0);
+        if (index === -1) {
+            index = matches.length;
+        }
+        matches.splice(index, 0, match);
+    }
+    
+    // The local copy no longer matches any server page, so stop trusting the ETag
+    matchesView.matches = matches;
+    matchesView.pages = new Map();
+    for (let page = 0; page < Math.ceil(matches.length / PAGE_SIZE); page++) {
+        matchesView.pages.set(page, true);
+    }
+    renderVisibleRows();
+}
+
+// Subscribe to live match deltas and patch the table in place
+function subscribeToMatchUpdates(candidateId, changeSeq) {
+    if (!window.EventSource) return null;
+    
+    const query = changeSeq ? `?since=${encodeURIComponent(changeSeq)}` : '';
+    const source = new EventSource(`${API_BASE_URL}/candidates/${candidateId}/matches/stream${query}`);
+    
+    const onMatch = (event) => {
+        const match = JSON.parse(event.data);
+        applyMatchDelta(match.jobId, match);
+    };
+    source.addEventListener('added', onMatch);
+    source.addEventListener('updated', onMatch);
+    
+    source.addEventListener('removed', (event) => {
+        applyMatchDelta(JSON.parse(event.data).jobId, null);
     });
+    
+    // The candidate's profile changed, so every score may have changed
+    source.addEventListener('reset', refreshVisibleMatches);
+    
+    source.addEventListener('closed', () => {
+        source.close();
+        showError('errorMessage', 'This candidate no longer exists.');
+    });
+    
+    return source;
 }
 
 // Initialize login page
@@ -195,12 +395,33 @@ async function initJobsViewPage() {
         return;
     }
     
+    matchesView.candidateId = candidateId;
+    
+    // Re-render the visible window on scroll, at most once per frame
+    const scroller = document.getElementById('jobsScroll');
+    if (scroller) {
+        let framePending = false;
+        scroller.addEventListener('scroll', () => {
+            if (framePending) return;
+            framePending = true;
+            requestAnimationFrame(() => {
+                framePending = false;
+                renderVisibleRows();
+            });
+        });
+    }
+    
     try {
-        // Fetch and display job matches
-        const matches = await fetchJobMatches(candidateId);
-        renderJobsTable(matches);
+        // Fetch and display the first page of matches, then keep them up to date
+        showLoading();
+        hideError('errorMessage');
+        const firstPage = await fetchJobMatches(candidateId);
+        renderJobsTable(firstPage);
+        subscribeToMatchUpdates(candidateId, firstPage.changeSeq);
     } catch (error) {
         showError('errorMessage', error.message || 'An error occurred while fetching job matches.');
+    } finally {
+        hideLoading();
     }
 }
 